@@ -0,0 +1,111 @@
+"""Import-time cost of the scraper, per enabled protocol.
+
+Runs a fresh interpreter with `-X importtime` for no protocols, each protocol
+on its own and all protocols, then reports the cumulative import time of the
+ingest path and what each protocol adds on top of the baseline.
+
+    python benchmarks/import_time.py [--runs 5] [--top 10]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.protocols import PROTOCOLS  # noqa: E402
+
+# Same path as `main.main()` up to the first connection
+STARTUP = (
+    "import time; t = time.perf_counter(); "
+    "import src.wss; "
+    "print(f'WALL {(time.perf_counter() - t) * 1e6:.0f}')"
+)
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run(protocols: list[str]) -> tuple[int, int, dict[str, int]]:
+    """Return (cumulative us of top-level imports, wall us, self us per module)."""
+    env = dict(
+        os.environ,
+        SOLANA_SCRAPER_PROTOCOLS=",".join(protocols),
+        PYTHONDONTWRITEBYTECODE="",
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = 0
+    self_times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        self_times[module] = self_times.get(module, 0) + int(self_us)
+        if len(indent) == 1:  # top-level import
+            cumulative += int(cumulative_us)
+    wall = int(proc.stdout.split("WALL ")[1])
+    return cumulative, wall, self_times
+
+
+def measure(protocols: list[str], runs: int) -> tuple[float, float, dict[str, int]]:
+    results = [run(protocols) for _ in range(runs)]
+    return (
+        statistics.median(r[0] for r in results) / 1000,
+        statistics.median(r[1] for r in results) / 1000,
+        results[-1][2],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="cold starts per profile (median is reported)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="heaviest modules to list for the full profile",
+    )
+    args = parser.parse_args()
+
+    profiles: dict[str, list[str]] = {"none": []}
+    profiles |= {name: [name] for name in PROTOCOLS} | {"all": list(PROTOCOLS)}
+    run(list(PROTOCOLS))  # warm the codec and bytecode caches
+
+    print(f"{'profile':<10} {'imports ms':>11} {'wall ms':>9} {'+ vs none':>10}")
+    baseline = None
+    full_modules: dict[str, int] = {}
+    for name, protocols in profiles.items():
+        imports_ms, wall_ms, modules = measure(protocols, args.runs)
+        if baseline is None:
+            baseline = wall_ms
+        added = wall_ms - baseline
+        print(f"{name:<10} {imports_ms:>11.1f} {wall_ms:>9.1f} {added:>+10.1f}")
+        if name == "all":
+            full_modules = modules
+
+    print("\nHeaviest modules (self time, all protocols):")
+    for module, self_us in sorted(full_modules.items(), key=lambda item: -item[1])[
+        : args.top
+    ]:
+        print(f"  {self_us / 1000:>7.2f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
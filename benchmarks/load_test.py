@@ -0,0 +1,257 @@
+"""Drive the real ingest path against the local mock Solana WebSocket.
+
+Starts `mock_solana_ws.py` in a separate process, connects the scraper's own
+`on_open` / `on_message` callbacks to it and steps the offered rate up. For
+every step it reports the sustained handled events/sec, frames dropped by the
+server because the client fell behind, and latency percentiles:
+
+    recv    frame received -> event handled (on_message, decode and handlers)
+    e2e     frame generated by the mock -> event handled (includes queueing)
+    B/ev    frame payload bytes received per decoded event (compressed with --deflate)
+
+The expected events/sec is what the mock sent minus the malformed, failed and
+duplicate frames it injected. The last rate with no drops, no growing backlog
+and handled events/sec within HANDLED_TOLERANCE of the expected rate is
+reported as the maximum sustainable rate.
+
+    python benchmarks/load_test.py --rates 1000,2000,4000,8000 --step-seconds 5 \\
+        --duplicate-ratio 0.05 --malformed-ratio 0.001
+"""
+import argparse
+import contextlib
+import multiprocessing
+import os
+import re
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import mock_solana_ws  # noqa: E402
+
+SENT_AT = re.compile(r'"mockSentAt": ([0-9.]+)')
+HANDLED_TOLERANCE = 0.95  # handled / expected events below this fails the step
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class Probe:
+    """Wraps the scraper callbacks and collects per-step counters and latencies."""
+
+    def __init__(self, wss: ModuleType):
+        self.wss = wss
+        self.frames = 0
+        self.handled = 0
+        self.recv_ms: list[float] = []
+        self.e2e_ms: list[float] = []
+        self.ws: Optional[Any] = None  # websocket.WebSocketApp
+
+        handle_event = wss.event_processor.handle_event
+
+        def counting_handle_event(event: Any) -> None:
+            handle_event(event)
+            self.handled += 1
+
+        wss.event_processor.handle_event = counting_handle_event
+
+    def on_message(self, ws: Any, message: str) -> None:
+        received_at = time.perf_counter()
+        sent_at = SENT_AT.search(message)
+        handled_before = self.handled
+        self.wss.on_message(ws, message)
+        self.frames += "logsNotification" in message  # not subscription replies
+        if self.handled != handled_before:
+            self.recv_ms.append((time.perf_counter() - received_at) * 1000)
+            if sent_at:
+                self.e2e_ms.append((time.time() - float(sent_at.group(1))) * 1000)
+
+    def take(self) -> tuple[int, int, list[float], list[float]]:
+        recv_ms, self.recv_ms = self.recv_ms, []
+        e2e_ms, self.e2e_ms = self.e2e_ms, []
+        return self.frames, self.handled, sorted(recv_ms), sorted(e2e_ms)
+
+
+def run_client(url: str, probe: Probe, stop: threading.Event) -> None:
+    import websocket
+
+    from src.transport import DEFLATE_OFFER
+
+    while not stop.is_set():
+        ws = websocket.WebSocketApp(
+            url,
+            on_message=probe.on_message,
+            on_error=probe.wss.on_error,
+            on_close=probe.wss.on_close,
+            header=[DEFLATE_OFFER] if probe.wss.offer_deflate else None,
+        )
+        ws.on_open = probe.wss.on_open
+        probe.ws = ws
+        ws.run_forever()
+        time.sleep(0.1)
+
+
+def wait_for_port(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError), socket.create_connection(
+            (host, port), timeout=0.5
+        ):
+            return
+        time.sleep(0.1)
+    raise TimeoutError(f"mock server did not start on {host}:{port}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--rates",
+        default="500,1000,2000,4000,8000,16000",
+        help="offered notifications/s per step",
+    )
+    parser.add_argument("--step-seconds", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument(
+        "--protocols", default=None, help="overrides SOLANA_SCRAPER_PROTOCOLS"
+    )
+    parser.add_argument(
+        "--event-ring",
+        action="store_true",
+        help="also publish to the shared-memory ring",
+    )
+    mock_solana_ws.add_arguments(parser)
+    args = parser.parse_args()
+    rates = [float(r) for r in args.rates.split(",")]
+
+    if args.protocols is not None:
+        os.environ["SOLANA_SCRAPER_PROTOCOLS"] = args.protocols
+
+    host = "127.0.0.1"
+    ctx = multiprocessing.get_context("spawn")
+    stats = mock_solana_ws.MockStats(0.0)
+    server = ctx.Process(
+        target=mock_solana_ws.serve,
+        args=(host, args.port, mock_solana_ws.config_from_args(args, 0.0), stats),
+        daemon=True,
+    )
+    server.start()
+    wait_for_port(host, args.port)
+
+    report = sys.stdout
+    stop = threading.Event()
+    # The handlers print every event; keep the report readable and printing unmeasured
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        from src import wss
+
+        wss.event_processor.start_tracking()  # as start_websocket does
+        if args.event_ring:
+            from src.event_ring import EventRingWriter
+
+            wss.event_processor.event_ring = EventRingWriter()
+        probe = Probe(wss)
+        client = threading.Thread(
+            target=run_client,
+            args=(f"ws://{host}:{args.port}/", probe, stop),
+            daemon=True,
+        )
+        client.start()
+        while stats.connections.value == 0:
+            time.sleep(0.05)
+        time.sleep(0.5)  # subscriptions
+
+        if wss.transport_stats.compressed:
+            print("permessage-deflate negotiated", file=report)
+        print(
+            f"{'offered/s':>10} {'frames/s':>9} {'expected/s':>10} {'events/s':>9}"
+            f" {'dropped':>8} {'backlog':>8} {'B/ev':>6}"
+            f" {'recv p50':>9} {'p95':>7} {'p99':>7}"
+            f" {'e2e p50':>9} {'p95':>7} {'p99':>7}  (ms)",
+            file=report,
+        )
+        max_sustained = None
+        for rate in rates:
+            before = stats.snapshot()
+            transport_before = wss.transport_stats.snapshot()
+            frames_before, handled_before, _, _ = probe.take()
+            stats.rate.value = rate
+            started = time.perf_counter()
+            time.sleep(args.step_seconds)
+            elapsed = time.perf_counter() - started
+            after = stats.snapshot()
+            frames, handled, recv_ms, e2e_ms = probe.take()
+            transport = wss.transport_stats.snapshot()
+            decoded = transport["events"] - transport_before["events"]
+            bytes_per_event = (
+                transport["wire_bytes"] - transport_before["wire_bytes"]
+            ) / max(decoded, 1)
+
+            delta = {k: after[k] - before[k] for k in after}
+            dropped = delta["dropped"]
+            backlog = after["sent"] - frames
+            # Every clean, first-seen frame carries one event; the rest are filtered out
+            expected_rate = (
+                delta["sent"]
+                - delta["malformed"]
+                - delta["failed"]
+                - delta["duplicates"]
+            ) / elapsed
+            handled_rate = (handled - handled_before) / elapsed
+            frame_rate = (frames - frames_before) / elapsed
+            recv = [percentile(recv_ms, q) for q in (0.5, 0.95, 0.99)]
+            e2e = [percentile(e2e_ms, q) for q in (0.5, 0.95, 0.99)]
+            print(
+                f"{rate:>10.0f} {frame_rate:>9.0f} {expected_rate:>10.0f}"
+                f" {handled_rate:>9.0f} {dropped:>8} {backlog:>8}"
+                f" {bytes_per_event:>6.0f}"
+                f" {recv[0]:>9.3f} {recv[1]:>7.3f} {recv[2]:>7.3f}"
+                f" {e2e[0]:>9.2f} {e2e[1]:>7.2f} {e2e[2]:>7.2f}",
+                file=report,
+            )
+            if (
+                dropped
+                or backlog > rate / 2
+                or handled_rate < HANDLED_TOLERANCE * expected_rate
+            ):
+                break
+            max_sustained = rate
+
+            # Let the client drain before the next step so steps do not bleed together
+            stats.rate.value = 0
+            deadline = time.monotonic() + 10
+            while stats.sent.value > probe.frames and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+        totals = stats.snapshot()
+        stats.rate.value = 0
+        stop.set()
+        if probe.ws is not None:
+            with contextlib.suppress(Exception):
+                probe.ws.close()
+
+    print(
+        f"\nmax sustained rate: {max_sustained:.0f}/s"
+        if max_sustained
+        else "\nnot sustained at the lowest offered rate",
+        file=report,
+    )
+    print(
+        "server totals: " + ", ".join(f"{k}={v}" for k, v in totals.items()),
+        file=report,
+    )
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
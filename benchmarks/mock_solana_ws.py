@@ -0,0 +1,601 @@
+"""Local stand-in for the Solana RPC WebSocket endpoint.
+
+Implements `logsSubscribe` / `logsNotification` over a minimal RFC 6455 server
+and streams synthetic transactions whose `Program data:` payloads are encoded
+with the real event codecs. Rate, event mix and duplication ratio are
+configurable, failed transactions, disconnects, slow frames and malformed
+payloads can be injected, and permessage-deflate is negotiated when enabled
+(optionally with server_no_context_takeover, and with messages split into
+continuation frames).
+Each connection has a bounded send queue; frames that do not fit (because the
+client is not keeping up) are dropped and counted.
+
+    python benchmarks/mock_solana_ws.py --port 8900 --rate 2000 --duplicate-ratio 0.1
+"""
+import argparse
+import base64
+import dataclasses
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import random
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.base58 import b58encode  # noqa: E402
+from src.idl_compiler import event_fields  # noqa: E402
+from src.protocols import PROTOCOLS  # noqa: E402
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_CONT, OP_TEXT, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x8, 0x9, 0xA
+
+DEFAULT_MIX: dict[str, float] = {
+    "PumpTradeEvent": 50,
+    "RaydiumSwapEvent": 20,
+    "JupiterSwapEvent": 15,
+    "PumpCreateEvent": 5,
+    "RaydiumLiquidityEvent": 4,
+    "PumpCompleteEvent": 2,
+    "JupiterCreatePoolEvent": 2,
+    "RaydiumInitPoolEvent": 2,
+}
+
+INSTRUCTIONS = {"SwapEvent": "Swap", "TradeEvent": "Buy", "LiquidityEvent": "Deposit"}
+
+
+@dataclass
+class MockConfig:
+    rate: float = 1000.0  # notifications per second per connection
+    mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    duplicate_ratio: float = 0.0  # resend the same transaction (same signature)
+    malformed_ratio: float = 0.0  # invalid JSON or undecodable program data
+    failed_ratio: float = 0.0  # notifications with `value.err` set
+    slow_ratio: float = 0.0  # stall the stream before a frame
+    slow_ms: float = 50.0
+    disconnect_after: float = 0.0  # drop each connection after N seconds; 0 = never
+    queue_size: int = 10_000
+    deflate: bool = False  # accept permessage-deflate when the client offers it
+    no_context_takeover: bool = (
+        False  # negotiate server_no_context_takeover: a fresh compressor per message
+    )
+    fragment_size: int = (
+        0  # split notifications into frames of at most N payload bytes; 0 = one frame
+    )
+    pool_size: int = 1024  # distinct synthetic transactions per event type
+    seed: int = 0
+
+
+class MockStats:
+    """Counters shared with a driver process; `rate` can be changed while running."""
+
+    FIELDS = (
+        "sent",
+        "dropped",
+        "duplicates",
+        "malformed",
+        "failed",
+        "slow",
+        "disconnects",
+        "connections",
+        "wire_bytes",
+    )
+
+    # One shared multiprocessing.Value per field, created in __init__
+    sent: Any
+    dropped: Any
+    duplicates: Any
+    malformed: Any
+    failed: Any
+    slow: Any
+    disconnects: Any
+    connections: Any
+    wire_bytes: Any
+
+    def __init__(self, rate: float):
+        self.rate = multiprocessing.Value("d", rate, lock=False)
+        for name in self.FIELDS:
+            setattr(self, name, multiprocessing.Value("q", 0, lock=False))
+
+    def add(self, name: str, n: int = 1) -> None:
+        # Single writer per counter per connection; approximate under concurrency
+        getattr(self, name).value += n
+
+    def snapshot(self) -> dict[str, int]:
+        return {name: getattr(self, name).value for name in self.FIELDS}
+
+
+class SyntheticTransactions:
+    """Pre-built log arrays for each event type, encoded with the real codecs."""
+
+    def __init__(self, config: MockConfig):
+        rng = random.Random(config.seed)
+        self.rng = rng
+        self.mints = [self._pubkey(rng) for _ in range(1000)]
+        self.wallets = [self._pubkey(rng) for _ in range(10_000)]
+        self.pools = [self._pubkey(rng) for _ in range(500)]
+
+        self.logs: dict[str, list[str]] = {}
+        self.protocol_of: dict[str, str] = {}
+        for protocol in PROTOCOLS.values():
+            layout = protocol.load()
+            types = {
+                name: {attr: field["type"] for attr, field in fields.items()}
+                for name, fields in event_fields(protocol.name).items()
+            }
+            for name, encoder in layout.EVENT_ENCODERS.items():
+                if name not in config.mix:
+                    continue
+                cls = getattr(layout, name)
+                self.protocol_of[name] = protocol.name
+                self.logs[name] = [
+                    json.dumps(
+                        self._logs(
+                            protocol.program_id,
+                            name,
+                            encoder(self._event(cls, types[name])),
+                        )
+                    )
+                    for _ in range(config.pool_size)
+                ]
+
+    @staticmethod
+    def _pubkey(rng: random.Random) -> str:
+        return b58encode(rng.randbytes(32))
+
+    def _event(self, cls: Any, idl_types: dict[str, Any]) -> Any:
+        rng = self.rng
+        values: dict[str, Any] = {}
+        for f in dataclasses.fields(cls):
+            if f.type is bool:
+                values[f.name] = rng.random() < 0.5
+            elif f.type is int:
+                bits = int(idl_types[f.name][1:])
+                values[f.name] = rng.randrange(1, min(1 << (bits - 1), 10**12))
+            elif f.name in ("name", "symbol", "uri"):
+                values[f.name] = f"mock-{f.name}-{rng.randrange(10**6)}"[
+                    : 10 if f.name == "symbol" else 32
+                ]
+            elif "mint" in f.name:
+                values[f.name] = rng.choice(self.mints)
+            elif f.name in ("user", "creator"):
+                values[f.name] = rng.choice(self.wallets)
+            elif f.name in ("amm_id", "pool", "bonding_curve"):
+                values[f.name] = rng.choice(self.pools)
+            else:
+                values[f.name] = self._pubkey(rng)
+        return cls(**values)
+
+    @staticmethod
+    def _logs(program_id: str, event_name: str, data: bytes) -> list[str]:
+        instruction = next(
+            (v for k, v in INSTRUCTIONS.items() if event_name.endswith(k)), "Create"
+        )
+        return [
+            f"Program {program_id} invoke [1]",
+            f"Program log: Instruction: {instruction}",
+            f"Program data: {base64.b64encode(data).decode()}",
+            f"Program {program_id} consumed 41512 of 200000 compute units",
+            f"Program {program_id} success",
+        ]
+
+
+def _frame(
+    opcode: int, payload: bytes, compressed: bool = False, fin: bool = True
+) -> bytes:
+    first = (
+        (0x80 if fin else 0) | (0x40 if compressed else 0) | opcode
+    )  # FIN, RSV1 for permessage-deflate
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", first, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", first, 126, length)
+    else:
+        header = struct.pack("!BBQ", first, 127, length)
+    return header + payload
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = b""
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("client closed the connection")
+        buf += chunk
+    return buf
+
+
+def _read_frame(sock: socket.socket) -> tuple[int, bytes]:
+    first, second = _recv_exact(sock, 2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", _recv_exact(sock, 2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", _recv_exact(sock, 8))
+    mask = _recv_exact(sock, 4) if second & 0x80 else b""
+    payload = _recv_exact(sock, length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return first & 0x0F, payload
+
+
+class Connection:
+    """One client: a reader for subscriptions, a paced generator and a writer."""
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        config: MockConfig,
+        stats: MockStats,
+        txs: SyntheticTransactions,
+        connection_id: int,
+    ):
+        self.sock = sock
+        self.config = config
+        self.stats = stats
+        self.txs = txs
+        # Seeded per connection (fds are reused after a reconnect): reproducible mix
+        self.rng = random.Random(f"{config.seed}:{connection_id}")
+        self.outbox: queue.Queue[bytes] = queue.Queue(config.queue_size)
+        self.subscriptions: dict[str, int] = {}  # protocol name -> subscription id
+        self.send_lock = threading.Lock()
+        self.closed = threading.Event()
+        self.slot = 300_000_000
+        # Random per connection and per run, so no signature repeats across
+        # reconnects or restarts
+        self.signature_prefix = os.urandom(56)
+        self.counter = 0
+        self.compressor: Optional[Any] = None
+
+    def handshake(self) -> None:
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("client closed during handshake")
+            request += chunk
+        headers = dict(
+            line.split(": ", 1)
+            for line in request.decode().split("\r\n")[1:]
+            if ": " in line
+        )
+        headers = {k.lower(): v for k, v in headers.items()}
+        accept = base64.b64encode(
+            hashlib.sha1(
+                (headers["sec-websocket-key"] + WEBSOCKET_GUID).encode()
+            ).digest()
+        ).decode()
+        extensions = ""
+        if self.config.deflate and "permessage-deflate" in headers.get(
+            "sec-websocket-extensions", ""
+        ):
+            # With context takeover one compressor spans the whole connection
+            self.compressor = self._new_compressor()
+            params = (
+                "; server_no_context_takeover"
+                if self.config.no_context_takeover
+                else ""
+            )
+            extensions = f"Sec-WebSocket-Extensions: permessage-deflate{params}\r\n"
+        self._send_raw(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"{extensions}"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode()
+        )
+
+    @staticmethod
+    def _new_compressor() -> Any:
+        return zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS
+        )
+
+    def _send_raw(self, data: bytes) -> None:
+        with self.send_lock:
+            self.sock.sendall(data)
+
+    def send_text(self, text: str) -> None:
+        self._send_raw(_frame(OP_TEXT, text.encode()))
+
+    def read_loop(self) -> None:
+        while not self.closed.is_set():
+            opcode, payload = _read_frame(self.sock)
+            if opcode == OP_CLOSE:
+                self._send_raw(_frame(OP_CLOSE, payload[:2]))
+                break
+            if opcode == OP_PING:
+                self._send_raw(_frame(OP_PONG, payload))
+            elif opcode == OP_TEXT:
+                self._handle_request(json.loads(payload))
+
+    def _handle_request(self, request: dict[str, Any]) -> None:
+        if request.get("method") != "logsSubscribe":
+            self.send_text(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request.get("id"),
+                        "error": {"code": -32601, "message": "Method not found"},
+                    }
+                )
+            )
+            return
+        mentions = request["params"][0].get("mentions", [])
+        subscription = len(self.subscriptions) + 1
+        for protocol in PROTOCOLS.values():
+            if protocol.program_id in mentions:
+                self.subscriptions[protocol.name] = subscription
+        self.send_text(
+            json.dumps(
+                {"jsonrpc": "2.0", "result": subscription, "id": request.get("id")}
+            )
+        )
+
+    def _next_frame(self, kinds: list[str], weights: list[float]) -> str:
+        rng = self.rng
+        if rng.random() < self.config.malformed_ratio:
+            self.stats.add("malformed")
+            if rng.random() < 0.5:
+                return '{"jsonrpc": "2.0", "method": "logsNotification", "params": {'
+            logs = '["Program data: %%%not-base64%%%", "Program data: AAAA"]'
+            subscription = next(iter(self.subscriptions.values()))
+        else:
+            kind = rng.choices(kinds, weights)[0]
+            logs = rng.choice(self.txs.logs[kind])
+            subscription = self.subscriptions[self.txs.protocol_of[kind]]
+
+        err = "null"
+        if rng.random() < self.config.failed_ratio:
+            self.stats.add("failed")
+            err = '{"InstructionError": [0, {"Custom": 6001}]}'
+
+        self.counter += 1
+        self.slot += rng.random() < 0.01
+        signature = b58encode(self.signature_prefix + self.counter.to_bytes(8, "big"))
+        return (
+            '{"jsonrpc": "2.0", "method": "logsNotification", "params": {"result": '
+            f'{{"context": {{"slot": {self.slot}, "mockSentAt": {time.time():.6f}}}, '
+            f'"value": {{"signature": "{signature}", "err": {err}, "logs": {logs}}}}}, '
+            f'"subscription": {subscription}}}}}'
+        )
+
+    def _offer(self, frame: str) -> None:
+        try:
+            self.outbox.put_nowait(frame.encode())
+            self.stats.add("sent")
+        except queue.Full:
+            self.stats.add("dropped")
+
+    def generate_loop(self) -> None:
+        rate = float("nan")  # unequal to any rate, so the first one starts the clock
+        started, produced = 0.0, 0
+        while not self.closed.is_set():
+            kinds = [
+                k
+                for k in self.txs.logs
+                if self.txs.protocol_of[k] in self.subscriptions
+            ]
+            current_rate = self.stats.rate.value
+            if current_rate != rate:
+                rate, started, produced = current_rate, time.perf_counter(), 0
+            if not kinds or rate <= 0:
+                time.sleep(0.01)
+                continue
+
+            weights = [self.config.mix[k] for k in kinds]
+            due = int((time.perf_counter() - started) * rate) - produced
+            for _ in range(min(due, 5000)):
+                frame = self._next_frame(kinds, weights)
+                self._offer(frame)
+                if self.rng.random() < self.config.duplicate_ratio:
+                    self.stats.add("duplicates")
+                    self._offer(frame)
+            produced += max(due, 0)
+            time.sleep(0.001)
+
+    def write_loop(self) -> None:
+        opened = time.monotonic()
+        while not self.closed.is_set():
+            if (
+                self.config.disconnect_after
+                and time.monotonic() - opened > self.config.disconnect_after
+            ):
+                self.stats.add("disconnects")
+                return
+            try:
+                payload = self.outbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if self.rng.random() < self.config.slow_ratio:
+                self.stats.add("slow")
+                time.sleep(self.config.slow_ms / 1000)
+            compressed = self.compressor is not None
+            if self.compressor is not None:
+                # Compressed in send order (shared context); sync-flush tail implied
+                payload = self.compressor.compress(payload) + self.compressor.flush(
+                    zlib.Z_SYNC_FLUSH
+                )
+                payload = payload[:-4]
+                if self.config.no_context_takeover:
+                    self.compressor = self._new_compressor()
+            self.stats.add("wire_bytes", len(payload))
+            self._send_raw(self._message_frames(payload, compressed))
+
+    def _message_frames(self, payload: bytes, compressed: bool) -> bytes:
+        size = self.config.fragment_size
+        if not size or len(payload) <= size:
+            return _frame(OP_TEXT, payload, compressed)
+        chunks = [payload[i : i + size] for i in range(0, len(payload), size)]
+        # RSV1 only on the first frame of a compressed message
+        frames = [_frame(OP_TEXT, chunks[0], compressed, fin=False)]
+        frames += [_frame(OP_CONT, chunk, fin=False) for chunk in chunks[1:-1]]
+        frames.append(_frame(OP_CONT, chunks[-1]))
+        return b"".join(frames)
+
+    def serve(self) -> None:
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.handshake()
+        self.stats.add("connections")
+        threads = [
+            threading.Thread(target=self._guard, args=(self.read_loop,), daemon=True),
+            threading.Thread(
+                target=self._guard, args=(self.generate_loop,), daemon=True
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+        self._guard(self.write_loop)
+        self.closed.set()
+        for thread in threads:
+            thread.join(timeout=1)
+
+    def _guard(self, loop: Any) -> None:
+        try:
+            loop()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.closed.set()
+
+
+class MockSolanaServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        config: MockConfig,
+        stats: Optional[MockStats] = None,
+    ):
+        self.config = config
+        self.stats = stats or MockStats(config.rate)
+        self.txs = SyntheticTransactions(config)
+        self.connection_ids = itertools.count()
+        server = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                try:
+                    Connection(
+                        self.request,
+                        server.config,
+                        server.stats,
+                        server.txs,
+                        next(server.connection_ids),
+                    ).serve()
+                except (ConnectionError, OSError, StopIteration):
+                    pass
+
+        super().__init__((host, port), Handler)
+
+
+def serve(
+    host: str, port: int, config: MockConfig, stats: Optional[MockStats] = None
+) -> None:
+    """Run the server until interrupted (also used as a multiprocessing target)."""
+    with MockSolanaServer(host, port, config, stats) as server:
+        server.serve_forever()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0)
+    parser.add_argument("--malformed-ratio", type=float, default=0.0)
+    parser.add_argument(
+        "--failed-ratio",
+        type=float,
+        default=0.0,
+        help="notifications with value.err set",
+    )
+    parser.add_argument("--slow-ratio", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=50.0)
+    parser.add_argument(
+        "--disconnect-after",
+        type=float,
+        default=0.0,
+        help="seconds per connection, 0 = never",
+    )
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    parser.add_argument(
+        "--deflate", action="store_true", help="accept permessage-deflate"
+    )
+    parser.add_argument(
+        "--no-context-takeover",
+        action="store_true",
+        help="with --deflate, negotiate server_no_context_takeover",
+    )
+    parser.add_argument(
+        "--fragment-size",
+        type=int,
+        default=0,
+        help="split frames at N payload bytes, 0 = never",
+    )
+    parser.add_argument(
+        "--mix",
+        default="",
+        help="e.g. PumpTradeEvent=5,RaydiumSwapEvent=1 (default: realistic mix)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_args(args: argparse.Namespace, rate: float) -> MockConfig:
+    mix = dict(DEFAULT_MIX)
+    if args.mix:
+        mix = {
+            name: float(weight)
+            for name, weight in (item.split("=") for item in args.mix.split(","))
+        }
+    return MockConfig(
+        rate=rate,
+        mix=mix,
+        duplicate_ratio=args.duplicate_ratio,
+        malformed_ratio=args.malformed_ratio,
+        failed_ratio=args.failed_ratio,
+        slow_ratio=args.slow_ratio,
+        slow_ms=args.slow_ms,
+        disconnect_after=args.disconnect_after,
+        queue_size=args.queue_size,
+        deflate=args.deflate,
+        no_context_takeover=args.no_context_takeover,
+        fragment_size=args.fragment_size,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--rate", type=float, default=1000.0)
+    add_arguments(parser)
+    args = parser.parse_args()
+    url = f"ws://{args.host}:{args.port}/"
+    print(f"Mock Solana WebSocket on {url} at {args.rate:.0f} notifications/s")
+    try:
+        serve(args.host, args.port, config_from_args(args, args.rate))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
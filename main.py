@@ -3,13 +3,26 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.wss import start_websocket
+from src.protocols import enabled_protocols
 
 
 def main():
     """Main entry point for the Solana DeFi Scraper."""
+    # Validate before importing src.wss, which builds the event processor for these protocols
+    try:
+        protocols = enabled_protocols()
+    except ValueError as e:
+        print(f"Invalid SOLANA_SCRAPER_PROTOCOLS: {e}")
+        sys.exit(1)
+    if not protocols:
+        print("SOLANA_SCRAPER_PROTOCOLS is empty; nothing to monitor")
+        sys.exit(1)
+
+    from src.wss import start_websocket
+
     print("Starting Solana DeFi Scraper...")
-    print("Monitoring Jupiter, Pump.fun, and Raydium protocols...")
+    names = [p.display_name for p in protocols]
+    print(f"Monitoring {', '.join(names)} protocols...")
     print("Press Ctrl+C to stop")
     print("-" * 50)
     
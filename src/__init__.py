@@ -1,4 +1,12 @@
-from .wss import start_websocket
+from typing import Any
 
 __version__ = "0.1.0"
 __all__ = ["start_websocket"]
+
+
+def __getattr__(name: str) -> Any:
+    # Importing the package stays cheap; the scraper and its protocols load on first use
+    if name == "start_websocket":
+        from .wss import start_websocket
+        return start_websocket
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
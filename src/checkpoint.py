@@ -0,0 +1,207 @@
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+from typing import Any, Optional, Protocol
+
+from .constants import CHECKPOINT_INTERVAL, CHECKPOINT_PATH
+
+MAGIC = b"SDSCKPT\x01"
+SECTION_HEADER = struct.Struct("<IQ")  # crc32, payload length
+BLOB_COUNT = struct.Struct("<I")
+BLOB_LENGTH = struct.Struct("<Q")
+
+
+class Checkpointable(Protocol):
+    """State that can be checkpointed.
+
+    `checkpoint_snapshot` runs on the checkpoint thread and should only copy
+    state under the component's lock; `encode_checkpoint` turns that copy into
+    blobs without holding any lock. `restore_checkpoint` must validate blobs
+    before mutating state.
+    """
+
+    def checkpoint_snapshot(self) -> Any:
+        ...
+
+    @staticmethod
+    def encode_checkpoint(snap: Any) -> list[bytes]:
+        ...
+
+    def restore_checkpoint(self, blobs: list[memoryview]) -> None:
+        ...
+
+
+def pack_blobs(blobs: list[bytes]) -> list[bytes]:
+    """Frame a list of blobs as count, lengths, then the blobs themselves."""
+    header = BLOB_COUNT.pack(len(blobs)) + b"".join(
+        BLOB_LENGTH.pack(len(b)) for b in blobs
+    )
+    return [header, *blobs]
+
+
+def unpack_blobs(buf: memoryview) -> list[memoryview]:
+    """Split a framed payload into zero-copy views of its blobs."""
+    (count,) = BLOB_COUNT.unpack_from(buf, 0)
+    offset = BLOB_COUNT.size + count * BLOB_LENGTH.size
+    blobs = []
+    for i in range(count):
+        (length,) = BLOB_LENGTH.unpack_from(buf, BLOB_COUNT.size + i * BLOB_LENGTH.size)
+        blobs.append(buf[offset : offset + length])
+        offset += length
+    if offset != len(buf):
+        raise ValueError("Blob lengths do not match payload size")
+    return blobs
+
+
+def array_from(typecode: str, buf: memoryview) -> array:
+    """Copy a blob into a new array (array() would iterate a memoryview per item)."""
+    result = array(typecode)
+    result.frombytes(buf)
+    return result
+
+
+class Checkpointer:
+    """Periodically writes component state to one file and restores it on startup.
+
+    File layout: magic, then per section a length-prefixed name, crc32, payload
+    length and payload. Writes go to a temporary file that is fsynced and
+    renamed over the previous checkpoint, so a crash never leaves a torn file.
+    """
+
+    def __init__(
+        self,
+        components: dict[str, Checkpointable],
+        path: str = CHECKPOINT_PATH,
+        interval: float = CHECKPOINT_INTERVAL,
+    ):
+        self.components = components
+        self.path = path
+        self.interval = interval
+        self.save_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def save(self) -> None:
+        """Snapshot every component and atomically replace the checkpoint file."""
+        with self.save_lock:
+            started = time.perf_counter()
+            snaps = {
+                name: c.checkpoint_snapshot() for name, c in self.components.items()
+            }
+            copied = time.perf_counter()
+
+            tmp_path = f"{self.path}.tmp"
+            size = 0
+            with open(tmp_path, "wb") as f:
+                f.write(MAGIC)
+                for name, snap in snaps.items():
+                    parts = pack_blobs(self.components[name].encode_checkpoint(snap))
+                    crc = 0
+                    length = 0
+                    for part in parts:
+                        crc = zlib.crc32(part, crc)
+                        length += len(part)
+                    encoded_name = name.encode()
+                    f.write(bytes([len(encoded_name)]) + encoded_name)
+                    f.write(SECTION_HEADER.pack(crc, length))
+                    f.writelines(parts)
+                    size += length
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+            total = time.perf_counter() - started
+            print(
+                f"Checkpoint written to {self.path}: {size / 1e6:.1f} MB, "
+                f"copy {1000 * (copied - started):.0f} ms, total {1000 * total:.0f} ms"
+            )
+
+    def load(self) -> bool:
+        """Restore components from the checkpoint file; return True on success."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return False
+
+        started = time.perf_counter()
+        with open(self.path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            buf = memoryview(mm)
+            try:
+                restored = self._load_sections(buf)
+            finally:
+                buf.release()
+
+        print(
+            f"Restored {', '.join(restored) or 'nothing'} from {self.path} "
+            f"in {1000 * (time.perf_counter() - started):.0f} ms"
+        )
+        return bool(restored)
+
+    def _load_sections(self, buf: memoryview) -> list[str]:
+        if bytes(buf[: len(MAGIC)]) != MAGIC:
+            print(f"Ignoring checkpoint {self.path}: bad magic")
+            return []
+
+        restored = []
+        offset = len(MAGIC)
+        while offset < len(buf):
+            # A torn or garbled section header means nothing after it can be located;
+            # stop there and let the remaining components start cold
+            try:
+                name_end = offset + 1 + buf[offset]
+                if name_end + SECTION_HEADER.size > len(buf):
+                    raise ValueError("truncated section header")
+                name = bytes(buf[offset + 1 : name_end]).decode()
+                crc, length = SECTION_HEADER.unpack_from(buf, name_end)
+                offset = name_end + SECTION_HEADER.size
+                if offset + length > len(buf):
+                    raise ValueError(f"section {name} truncated")
+            except (struct.error, UnicodeDecodeError, IndexError, ValueError) as e:
+                print(f"Ignoring rest of checkpoint {self.path} at byte {offset}: {e}")
+                break
+            payload = buf[offset : offset + length]
+            offset += length
+
+            component = self.components.get(name)
+            if component is None:
+                continue
+            if zlib.crc32(payload) != crc:
+                print(f"Ignoring checkpoint section {name}: checksum mismatch")
+                continue
+            try:
+                component.restore_checkpoint(unpack_blobs(payload))
+            except Exception as e:
+                print(f"Ignoring checkpoint section {name}: {e}")
+                continue
+            restored.append(name)
+        return restored
+
+    def _save_logged(self) -> None:
+        # A failed checkpoint is reported, never allowed to take the scraper down
+        try:
+            self.save()
+        except Exception as e:
+            print(f"Checkpoint failed: {e}")
+
+    def _run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self._save_logged()
+
+    def start(self) -> None:
+        """Start the background checkpoint thread; safe to call more than once."""
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name="checkpoint", daemon=True)
+        self.thread.start()
+
+    def stop(self, final_save: bool = True) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if final_save:
+            self._save_logged()
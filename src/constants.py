@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 # Jupiter V6 program ID
 JUPITER_PROGRAM_ID = "JUP6LkbZbjS1jKKwapdHNy74zcZ3tLUZoi5QNyVTaV4"
 
@@ -17,3 +20,42 @@ class EventTypes:
     PUMP_COMPLETE = "pump_complete"
     RAYDIUM_SWAP = "raydium_swap"
     RAYDIUM_INIT_POOL = "raydium_init_pool"
+
+# Local query API for in-memory state (leaderboards, indexes)
+QUERY_API_HOST = "127.0.0.1"
+QUERY_API_PORT = 8787
+
+# Periodic snapshot of in-memory state, restored on startup
+CHECKPOINT_PATH = "scraper_state.ckpt"
+CHECKPOINT_INTERVAL = 60  # seconds
+
+# Shared-memory ring of decoded events for local consumers (see src/event_ring.py)
+EVENT_RING_ENABLED = True
+EVENT_RING_PATH = os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+    "solana-defi-events.ring",
+)
+EVENT_RING_CAPACITY = 65536  # records of 512 bytes
+
+# Generated IDL codecs, keyed by IDL and compiler hash (see src/idl_compiler.py)
+CODEC_CACHE_DIR = os.environ.get(
+    "SOLANA_SCRAPER_CODEC_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "solana-defi-scraper", "codecs"),
+)
+
+# Protocols to decode; only their layouts and codecs are imported
+ENABLED_PROTOCOLS = [
+    name.strip()
+    for name in os.environ.get("SOLANA_SCRAPER_PROTOCOLS", "jupiter,pump,raydium").split(",")
+    if name.strip()
+]
+
+# On-demand profiling (SIGUSR1 = cProfile, SIGUSR2 = sampling, or GET /profile)
+PROFILE_DIR = "profiles"
+PROFILE_SECONDS = 30
+PROFILE_MAX_SECONDS = 600
+PROFILE_SAMPLE_INTERVAL = 0.001  # seconds between stack samples
+
+# Subscription transport (see src/transport.py)
+WS_PERMESSAGE_DEFLATE = True  # offer permessage-deflate in the handshake
+SKIP_FAILED_TRANSACTIONS = True  # drop `value.err != null` notifications before parsing
@@ -1,47 +1,43 @@
+from __future__ import annotations
+
 import base64
-from typing import Union, Optional
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Union, Optional
 from dataclasses import asdict
 
-from .jupiter_layout import (
-    decode_jupiter_create_pool_event,
-    decode_jupiter_swap_event,
-    JupiterCreatePoolEvent,
-    JupiterSwapEvent
-)
-from .pump_layout import (
-    decode_pump_create_event,
-    decode_pump_trade_event,
-    decode_pump_complete_event,
-    PumpCreateEvent,
-    PumpTradeEvent,
-    PumpCompleteEvent
-)
-from .raydium_layout import (
-    decode_raydium_init_pool_event,
-    decode_raydium_swap_event,
-    decode_raydium_liquidity_event,
-    decode_raydium_event,
-    RaydiumInitPoolEvent,
-    RaydiumSwapEvent,
-    RaydiumLiquidityEvent
-)
 from .constants import JUPITER_PROGRAM_ID, PUMP_FUN_PROGRAM_ID, RAYDIUM_V4_PROGRAM_ID
+from .market_state import MarketState
+from .protocols import enabled_protocols
+
+# Layout modules are imported per enabled protocol in EventProcessor.__init__,
+# the leaderboard and wallet index in EventProcessor.start_tracking
+if TYPE_CHECKING:
+    from .event_ring import EventRingWriter
+    from .leaderboard import Leaderboard
+    from .wallet_index import WalletIndex
+    from .jupiter_layout import JupiterCreatePoolEvent, JupiterSwapEvent
+    from .pump_layout import PumpCreateEvent, PumpTradeEvent, PumpCompleteEvent
+    from .raydium_layout import RaydiumInitPoolEvent, RaydiumSwapEvent, RaydiumLiquidityEvent
 
-SolanaEvent = Union[
-    JupiterCreatePoolEvent,
-    JupiterSwapEvent,
-    PumpCreateEvent,
-    PumpTradeEvent,
-    PumpCompleteEvent,
-    RaydiumInitPoolEvent,
-    RaydiumSwapEvent,
-    RaydiumLiquidityEvent
-]
+    SolanaEvent = Union[
+        JupiterCreatePoolEvent,
+        JupiterSwapEvent,
+        PumpCreateEvent,
+        PumpTradeEvent,
+        PumpCompleteEvent,
+        RaydiumInitPoolEvent,
+        RaydiumSwapEvent,
+        RaydiumLiquidityEvent
+    ]
 
 class EventProcessor:
     """Processes Solana transaction logs and extracts DEX events."""
     
-    def __init__(self):
+    def __init__(self, protocols: Optional[Iterable[str]] = None):
+        self.layouts = {p.name: p.load() for p in enabled_protocols(protocols)}
+        self.jupiter = self.layouts.get("jupiter")
+        self.pump = self.layouts.get("pump")
+        self.raydium = self.layouts.get("raydium")
+
         self.event_handlers = {
             "jupiter_swap": self._handle_jupiter_swap,
             "jupiter_create_pool": self._handle_jupiter_create_pool,
@@ -52,48 +48,94 @@ class EventProcessor:
             "raydium_swap": self._handle_raydium_swap,
             "raydium_liquidity": self._handle_raydium_liquidity,
         }
+        self.handlers_by_class: dict[str, Callable[[Any], None]] = {
+            "JupiterSwapEvent": self._handle_jupiter_swap,
+            "JupiterCreatePoolEvent": self._handle_jupiter_create_pool,
+            "PumpCreateEvent": self._handle_pump_create,
+            "PumpTradeEvent": self._handle_pump_trade,
+            "PumpCompleteEvent": self._handle_pump_complete,
+            "RaydiumInitPoolEvent": self._handle_raydium_init_pool,
+            "RaydiumSwapEvent": self._handle_raydium_swap,
+            "RaydiumLiquidityEvent": self._handle_raydium_liquidity,
+        }
+        self.generic_decoders = self._generic_decoders()
+        self.market_state = MarketState()
+        self.leaderboard: Optional[Leaderboard] = None
+        self.wallet_index: Optional[WalletIndex] = None
+        # State updated with every handled event
+        self.recorders = [self.market_state.record]
+        self.event_ring: Optional[EventRingWriter] = None
+
+    def start_tracking(self) -> tuple[Leaderboard, WalletIndex]:
+        """Build the leaderboard and wallet index once and return them.
+
+        Deferred until the scraper starts: allocating the leaderboard sketches
+        takes about 10 ms and neither is needed to decode events.
+        """
+        if self.leaderboard is None or self.wallet_index is None:
+            from .leaderboard import Leaderboard
+            from .wallet_index import WalletIndex
+
+            self.leaderboard = Leaderboard()
+            self.wallet_index = WalletIndex()
+            self.recorders = [self.leaderboard.record, self.wallet_index.record, self.market_state.record]
+        return self.leaderboard, self.wallet_index
         
     def process_logs(self, logs: list[str]) -> Optional[SolanaEvent]:
         """Process transaction logs and return any decoded events."""
         logs_str = "".join(logs)
         
-        if "JUP" in logs_str or JUPITER_PROGRAM_ID in logs_str:
+        if self.jupiter and ("JUP" in logs_str or JUPITER_PROGRAM_ID in logs_str):
             return self._process_jupiter_logs(logs, logs_str)
         
-        elif RAYDIUM_V4_PROGRAM_ID in logs_str or "ray_log:" in logs_str:
+        elif self.raydium and (RAYDIUM_V4_PROGRAM_ID in logs_str or "ray_log:" in logs_str):
             return self._process_raydium_logs(logs, logs_str)
         
-        elif PUMP_FUN_PROGRAM_ID in logs_str:
+        elif self.pump and PUMP_FUN_PROGRAM_ID in logs_str:
             return self._process_pump_logs(logs, logs_str)
         
         return self._process_generic_logs(logs, logs_str)
     
     def _process_jupiter_logs(self, logs: list[str], logs_str: str) -> Optional[SolanaEvent]:
         """Process Jupiter-specific logs."""
+        jupiter = self.jupiter
+        assert jupiter is not None  # only called with the protocol enabled
+        event = self._extract_and_dispatch(logs, jupiter.DISCRIMINATORS)
+        if event:
+            return event
+
         if "Program log: Instruction: Swap" in logs_str:
-            return self._extract_and_decode(logs, decode_jupiter_swap_event)
+            return self._extract_and_decode(logs, jupiter.decode_jupiter_swap_event)
         
-        return self._extract_and_decode(logs, decode_jupiter_create_pool_event)
+        return self._extract_and_decode(logs, jupiter.decode_jupiter_create_pool_event)
     
     def _process_raydium_logs(self, logs: list[str], logs_str: str) -> Optional[SolanaEvent]:
         """Process Raydium-specific logs."""
+        raydium = self.raydium
+        assert raydium is not None  # only called with the protocol enabled
+        event = self._extract_and_dispatch(logs, raydium.DISCRIMINATORS)
+        if event:
+            return event
+
         for decoder in [
-            decode_raydium_swap_event,
-            decode_raydium_liquidity_event,
-            decode_raydium_init_pool_event
+            raydium.decode_raydium_swap_event,
+            raydium.decode_raydium_liquidity_event,
+            raydium.decode_raydium_init_pool_event
         ]:
             event = self._extract_and_decode(logs, decoder)
             if event:
                 return event
         
-        return self._extract_and_decode_bytes(logs, decode_raydium_event)
+        return self._extract_and_decode_bytes(logs, raydium.decode_raydium_event)
     
     def _process_pump_logs(self, logs: list[str], logs_str: str) -> Optional[SolanaEvent]:
         """Process pump.fun-specific logs."""
+        pump = self.pump
+        assert pump is not None  # only called with the protocol enabled
         for decoder in [
-            lambda b64: decode_pump_create_event(base64.b64decode(b64)),
-            lambda b64: decode_pump_trade_event(base64.b64decode(b64)),
-            lambda b64: decode_pump_complete_event(base64.b64decode(b64))
+            lambda b64: pump.decode_pump_create_event(base64.b64decode(b64)),
+            lambda b64: pump.decode_pump_trade_event(base64.b64decode(b64)),
+            lambda b64: pump.decode_pump_complete_event(base64.b64decode(b64))
         ]:
             event = self._extract_and_decode(logs, decoder)
             if event:
@@ -106,22 +148,36 @@ class EventProcessor:
         if "Program data: " not in logs_str:
             return None
         
-        for decoder in [
-            decode_jupiter_swap_event,
-            decode_jupiter_create_pool_event,
-            lambda b64: decode_pump_create_event(base64.b64decode(b64)),
-            lambda b64: decode_pump_trade_event(base64.b64decode(b64)),
-            lambda b64: decode_pump_complete_event(base64.b64decode(b64)),
-            decode_raydium_swap_event,
-            decode_raydium_liquidity_event,
-            decode_raydium_init_pool_event,
-        ]:
+        for decoder in self.generic_decoders:
             event = self._extract_and_decode(logs, decoder)
             if event:
                 return event
         
         return None
     
+    def _generic_decoders(self) -> list:
+        """Base64 decoders of every enabled protocol, in fallback order."""
+        decoders = []
+        if self.jupiter:
+            decoders += [
+                self.jupiter.decode_jupiter_swap_event,
+                self.jupiter.decode_jupiter_create_pool_event,
+            ]
+        if self.pump:
+            pump = self.pump
+            decoders += [
+                lambda b64: pump.decode_pump_create_event(base64.b64decode(b64)),
+                lambda b64: pump.decode_pump_trade_event(base64.b64decode(b64)),
+                lambda b64: pump.decode_pump_complete_event(base64.b64decode(b64)),
+            ]
+        if self.raydium:
+            decoders += [
+                self.raydium.decode_raydium_swap_event,
+                self.raydium.decode_raydium_liquidity_event,
+                self.raydium.decode_raydium_init_pool_event,
+            ]
+        return decoders
+    
     def _extract_and_decode(self, logs: list[str], decoder_func) -> Optional[SolanaEvent]:
         """Extract program data from logs and decode using the provided function."""
         for log_entry in logs:
@@ -135,6 +191,24 @@ class EventProcessor:
                     continue
         return None
     
+    def _extract_and_dispatch(
+        self, logs: list[str], discriminators: dict[bytes, Callable[[bytes], Optional[SolanaEvent]]]
+    ) -> Optional[SolanaEvent]:
+        """Decode the first program data entry whose discriminator is in the dispatch table."""
+        for log_entry in logs:
+            if log_entry.startswith("Program data: "):
+                b64 = log_entry.split("Program data: ", 1)[1]
+                try:
+                    raw_bytes = base64.b64decode(b64)
+                except Exception:
+                    continue
+                decoder = discriminators.get(raw_bytes[:8])
+                if decoder:
+                    event = decoder(raw_bytes)
+                    if event:
+                        return event
+        return None
+    
     def _extract_and_decode_bytes(self, logs: list[str], decoder_func) -> Optional[SolanaEvent]:
         """Extract program data from logs and decode using a bytes-based decoder."""
         for log_entry in logs:
@@ -192,23 +266,14 @@ class EventProcessor:
     def handle_event(self, event: SolanaEvent):
         """Handle any decoded event by dispatching to the appropriate handler."""
         event_type = type(event).__name__
+        for record in self.recorders:
+            record(event)
+        if self.event_ring is not None:
+            self.event_ring.publish(event)
         
-        if isinstance(event, JupiterSwapEvent):
-            self._handle_jupiter_swap(event)
-        elif isinstance(event, JupiterCreatePoolEvent):
-            self._handle_jupiter_create_pool(event)
-        elif isinstance(event, PumpCreateEvent):
-            self._handle_pump_create(event)
-        elif isinstance(event, PumpTradeEvent):
-            self._handle_pump_trade(event)
-        elif isinstance(event, PumpCompleteEvent):
-            self._handle_pump_complete(event)
-        elif isinstance(event, RaydiumInitPoolEvent):
-            self._handle_raydium_init_pool(event)
-        elif isinstance(event, RaydiumSwapEvent):
-            self._handle_raydium_swap(event)
-        elif isinstance(event, RaydiumLiquidityEvent):
-            self._handle_raydium_liquidity(event)
+        handler = self.handlers_by_class.get(event_type)
+        if handler:
+            handler(event)
         else:
             print(f"=== UNKNOWN EVENT TYPE: {event_type} ===")
             print(asdict(event))
@@ -0,0 +1,384 @@
+"""Single-producer, multi-consumer ring of decoded events in a memory-mapped file.
+
+File layout (little endian):
+  header page (4096 bytes): magic, version, record size, capacity, generation,
+                            write cursor (sequence number of the next record)
+  record slots:             capacity * RECORD_SIZE bytes
+
+Each record is `seq (u64) | recv_time (f64) | kind (u16) | length (u16)`
+followed by the event fields packed with the fixed-width format for its kind.
+The writer marks a slot busy before filling it and stores the real sequence
+number last; a reader copies nothing and re-checks the sequence number after
+use, so a slot overwritten while being read shows up as an overrun. The writer
+holds an exclusive flock on the file, so a second scraper cannot attach to it.
+Readers map the file read-only and remap it when the writer recreates it.
+"""
+import fcntl
+import mmap
+import os
+import struct
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+from .base58 import b58encode, pubkey_bytes
+from .constants import EVENT_RING_CAPACITY, EVENT_RING_PATH
+from .idl_compiler import PRIMITIVES, event_fields
+
+MAGIC = b"SDSRING\x01"
+HEADER_SIZE = 4096
+RECORD_SIZE = 512
+FILE_HEADER = struct.Struct(
+    "<8sIIQQ"
+)  # magic, record size, capacity, generation, reserved
+CURSOR = struct.Struct("<Q")
+CURSOR_OFFSET = 64
+RECORD_HEADER = struct.Struct("<QdHH")  # seq, recv_time, kind, length
+BUSY = 1 << 63
+
+# Kind code = position in this table, so entries are append-only. Each kind is
+# (protocol, event class); its fields and their widths come from the event's
+# definition in src/idl/<protocol>.json.
+RECORD_KINDS = (
+    ("jupiter", "JupiterCreatePoolEvent"),
+    ("jupiter", "JupiterSwapEvent"),
+    ("pump", "PumpCreateEvent"),
+    ("pump", "PumpTradeEvent"),
+    ("pump", "PumpCompleteEvent"),
+    ("raydium", "RaydiumInitPoolEvent"),
+    ("raydium", "RaydiumSwapEvent"),
+    ("raydium", "RaydiumLiquidityEvent"),
+)
+STRING_FIELD_SIZE = (
+    64  # variable-length IDL strings are stored truncated to this many bytes
+)
+
+
+class RecordFormat:
+    """Compiled fixed-width format for one event kind."""
+
+    def __init__(self, kind: int, name: str, idl_fields: dict[str, dict[str, Any]]):
+        self.kind = kind
+        self.name = name
+        self.fields = list(idl_fields)
+        self.encoders: list[Callable[[Any], Any]] = []
+        self.decoders: list[Callable[[Any], Any]] = []
+        fmt = "<"
+        for field in idl_fields.values():
+            code, encoder, decoder = _field_format(field)
+            fmt += code
+            self.encoders.append(encoder)
+            self.decoders.append(decoder)
+        self.struct = struct.Struct(fmt)
+        if RECORD_HEADER.size + self.struct.size > RECORD_SIZE:
+            raise ValueError(f"{name} record does not fit in {RECORD_SIZE} bytes")
+
+    def pack_into(self, buf: Any, offset: int, event: Any) -> None:
+        self.struct.pack_into(
+            buf,
+            offset,
+            *(enc(getattr(event, f)) for f, enc in zip(self.fields, self.encoders)),
+        )
+
+    def unpack_from(self, buf: Any, offset: int = 0) -> dict[str, Any]:
+        values = self.struct.unpack_from(buf, offset)
+        return {f: dec(v) for f, dec, v in zip(self.fields, self.decoders, values)}
+
+
+def _field_format(
+    field: dict[str, Any]
+) -> tuple[str, Callable[[Any], Any], Callable[[Any], Any]]:
+    """Return (struct format, encoder, decoder) for an IDL field."""
+    ftype = field["type"]
+    if ftype in ("publicKey", "pubkey"):
+        return "32s", pubkey_bytes, b58encode
+    if ftype == "string":
+        return f"{STRING_FIELD_SIZE}s", str.encode, _text
+    if isinstance(ftype, dict) and "array" in ftype:
+        item, length = ftype["array"]
+        if item != "u8":
+            raise ValueError(
+                f"Unsupported array item type {item!r} for field {field['name']!r}"
+            )
+        return (
+            (f"{length}s", str.encode, _text)
+            if field.get("utf8")
+            else (f"{length}s", _identity, bytes)
+        )
+    if ftype in ("u128", "i128"):
+        signed = ftype == "i128"
+        return (
+            "16s",
+            lambda v: v.to_bytes(16, "little", signed=signed),
+            lambda b: int.from_bytes(b, "little", signed=signed),
+        )
+    if ftype not in PRIMITIVES:
+        raise ValueError(f"Unsupported IDL type {ftype!r} for field {field['name']!r}")
+    return PRIMITIVES[ftype][0], _identity, _identity
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _text(raw: bytes) -> str:
+    return raw.rstrip(b"\x00").decode("utf-8", "replace")
+
+
+RECORD_FORMATS = [
+    RecordFormat(kind, name, event_fields(protocol)[name])
+    for kind, (protocol, name) in enumerate(RECORD_KINDS)
+]
+FORMATS_BY_NAME = {f.name: f for f in RECORD_FORMATS}
+
+
+def _read_header(fd: int) -> tuple[bytes, int, int, int, int]:
+    return FILE_HEADER.unpack(
+        os.pread(fd, FILE_HEADER.size, 0).ljust(FILE_HEADER.size, b"\x00")
+    )
+
+
+class EventRingWriter:
+    """Publishes decoded events into the ring.
+
+    A second writer on the same file raises RuntimeError.
+    """
+
+    def __init__(
+        self, path: str = EVENT_RING_PATH, capacity: int = EVENT_RING_CAPACITY
+    ):
+        self.path = path
+        self.capacity = capacity
+        size = HEADER_SIZE + capacity * RECORD_SIZE
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise RuntimeError(f"Event ring {path} already has a writer") from None
+            magic, record_size, existing_capacity, generation, _ = _read_header(self.fd)
+            same_geometry = (
+                magic == MAGIC
+                and record_size == RECORD_SIZE
+                and existing_capacity == capacity
+                and os.fstat(self.fd).st_size == size
+            )
+            if not same_geometry:
+                # Clear the header before resizing: attached readers see the generation
+                # change and remap instead of touching slots past the new end of file
+                os.pwrite(self.fd, bytes(FILE_HEADER.size), 0)
+                os.ftruncate(self.fd, size)
+            self.mm = mmap.mmap(self.fd, size)
+        except Exception:
+            os.close(self.fd)
+            raise
+
+        if same_geometry:
+            # Same geometry: keep the cursor so attached readers carry on
+            self.generation = generation
+            (self.next_seq,) = CURSOR.unpack_from(self.mm, CURSOR_OFFSET)
+        else:
+            self.generation = int.from_bytes(os.urandom(8), "little")
+            self.next_seq = 0
+            self.mm[:HEADER_SIZE] = bytes(HEADER_SIZE)
+            FILE_HEADER.pack_into(
+                self.mm, 0, MAGIC, RECORD_SIZE, capacity, self.generation, 0
+            )
+            CURSOR.pack_into(self.mm, CURSOR_OFFSET, 0)
+
+    def publish(self, event: Any, recv_time: Optional[float] = None) -> bool:
+        """Append an event; return False for event types without a record format."""
+        fmt = FORMATS_BY_NAME.get(type(event).__name__)
+        if fmt is None:
+            return False
+        if recv_time is None:
+            recv_time = time.time()
+
+        seq = self.next_seq
+        offset = HEADER_SIZE + (seq % self.capacity) * RECORD_SIZE
+        mm = self.mm
+        CURSOR.pack_into(mm, offset, seq | BUSY)
+        try:
+            fmt.pack_into(mm, offset + RECORD_HEADER.size, event)
+        except (struct.error, ValueError) as e:
+            print(f"Event ring: cannot encode {fmt.name}: {e}")
+            CURSOR.pack_into(mm, offset, BUSY)
+            return False
+        RECORD_HEADER.pack_into(
+            mm, offset, seq | BUSY, recv_time, fmt.kind, fmt.struct.size
+        )
+        CURSOR.pack_into(mm, offset, seq)
+        self.next_seq = seq + 1
+        CURSOR.pack_into(mm, CURSOR_OFFSET, self.next_seq)
+        return True
+
+    def close(self) -> None:
+        self.mm.close()
+        os.close(self.fd)
+
+
+@dataclass
+class RingRecord:
+    """One record as read from the ring.
+
+    `payload` is a zero-copy view into the shared mapping and is only
+    guaranteed intact while `reader.is_current(record)` is True.
+    """
+
+    seq: int
+    recv_time: float
+    kind: int
+    payload: memoryview
+
+    @property
+    def event_type(self) -> str:
+        return RECORD_FORMATS[self.kind].name
+
+    def decode(self) -> dict[str, Any]:
+        return RECORD_FORMATS[self.kind].unpack_from(self.payload)
+
+
+class EventRingReader:
+    """Consumes the ring at its own cursor, counting records lost to overruns."""
+
+    def __init__(self, path: str = EVENT_RING_PATH, from_start: bool = False):
+        self.path = path
+        self._open()
+        self.dropped = 0
+        head = self.head()
+        self.cursor = max(head - self.capacity, 0) if from_start else head
+
+    def _open(self) -> None:
+        """Map the ring read-only at the size given by its current header."""
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            magic, record_size, capacity, generation, _ = _read_header(fd)
+            if magic != MAGIC or record_size != RECORD_SIZE:
+                raise ValueError(f"{self.path} is not an event ring")
+            size = HEADER_SIZE + capacity * RECORD_SIZE
+            stat = os.fstat(fd)
+            if stat.st_size < size:
+                raise ValueError(f"{self.path} is shorter than its header says")
+            mm = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+        except Exception:
+            os.close(fd)
+            raise
+        self.fd, self.mm = fd, mm
+        self.capacity = capacity
+        self.generation = generation
+        self.inode = (stat.st_dev, stat.st_ino)
+
+    def _generation(self) -> int:
+        generation: int = FILE_HEADER.unpack_from(self.mm, 0)[3]
+        return generation
+
+    def head(self) -> int:
+        """Sequence number the writer will publish next."""
+        seq: int = CURSOR.unpack_from(self.mm, CURSOR_OFFSET)[0]
+        return seq
+
+    def lag(self) -> int:
+        return self.head() - self.cursor
+
+    def is_current(self, record: RingRecord) -> bool:
+        """True if the record's slot has not been reused since it was read."""
+        offset = HEADER_SIZE + (record.seq % self.capacity) * RECORD_SIZE
+        seq: int = CURSOR.unpack_from(self.mm, offset)[0]
+        return seq == record.seq
+
+    def read(self) -> Optional[RingRecord]:
+        """Return the next record, or None once the reader has caught up."""
+        if self._generation() != self.generation:
+            self._reopen("was recreated")
+            return None
+
+        while True:
+            head = self.head()
+            if self.cursor >= head:
+                if self._replaced():
+                    self._reopen("was replaced")
+                return None
+            if head - self.cursor > self.capacity:
+                self._skip_to(head - self.capacity)
+
+            offset = HEADER_SIZE + (self.cursor % self.capacity) * RECORD_SIZE
+            seq, recv_time, kind, length = RECORD_HEADER.unpack_from(self.mm, offset)
+            if seq != self.cursor:
+                # Lapped while reading the cursor, or the slot is mid-write
+                self._skip_to(max(head - self.capacity, self.cursor) + 1)
+                continue
+
+            record = RingRecord(
+                seq,
+                recv_time,
+                kind,
+                memoryview(self.mm)[
+                    offset + RECORD_HEADER.size : offset + RECORD_HEADER.size + length
+                ],
+            )
+            self.cursor += 1
+            return record
+
+    def __iter__(self) -> Iterator[RingRecord]:
+        """Iterate over the records currently available."""
+        while (record := self.read()) is not None:
+            yield record
+
+    def follow(self, poll_interval: float = 0.001) -> Iterator[RingRecord]:
+        """Iterate forever, sleeping briefly whenever the reader is caught up."""
+        while True:
+            record = self.read()
+            if record is None:
+                time.sleep(poll_interval)
+                continue
+            yield record
+
+    def _replaced(self) -> bool:
+        """True if the path now names a different file than the one mapped."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self.inode
+
+    def _reopen(self, reason: str) -> None:
+        """Remap the ring after the writer recreated it and restart from its head.
+
+        If the new ring is not complete yet (header being rewritten, file being
+        resized), keep the old mapping and try again on the next read.
+        """
+        fd, mm = self.fd, self.mm
+        try:
+            self._open()
+        except (OSError, ValueError):
+            return
+        self._release(fd, mm)
+        print(f"Event ring {self.path} {reason}; restarting from its head")
+        self.cursor = self.head()
+
+    @staticmethod
+    def _release(fd: int, mm: mmap.mmap) -> None:
+        try:
+            mm.close()
+        except BufferError:
+            pass  # records still hold views into it; the mapping goes when they do
+        os.close(fd)
+
+    def _skip_to(self, seq: int) -> None:
+        self.dropped += seq - self.cursor
+        self.cursor = seq
+
+    def close(self) -> None:
+        self._release(self.fd, self.mm)
+
+
+if __name__ == "__main__":
+    import sys
+
+    reader = EventRingReader(sys.argv[1] if len(sys.argv) > 1 else EVENT_RING_PATH)
+    for record in reader.follow():
+        event = record.decode()
+        if reader.is_current(record):
+            print(
+                f"[{record.seq}] {record.event_type} {event} (dropped={reader.dropped})"
+            )
@@ -0,0 +1,355 @@
+"""Compile Anchor IDL event definitions into Python codec modules.
+
+For every event in an IDL this generates a slotted dataclass, a decoder that
+unpacks the event with precompiled `struct.Struct`s, the matching encoder, and,
+when events carry the 8-byte Anchor discriminator, a dispatch table from
+discriminator to decoder.
+
+Generated modules are written to the codec cache keyed by a hash of the IDL
+and of this file, so later startups only import them (Python's own .pyc
+cache then skips recompilation as well). Type checkers cannot see those
+modules, so each bundled IDL also has a committed stub, src/<protocol>_codecs.pyi,
+generated with `python -m src.idl_compiler --stub src/idl/<protocol>.json`.
+
+Repo-specific IDL extensions:
+  metadata.eventHeader       bytes before the event fields (default 8, the
+                             Anchor discriminator; 0 for headerless payloads)
+  metadata.eventClassPrefix  prefix for generated class names, e.g. "Pump"
+  field "utf8": true         decode a fixed u8 array as NUL-padded UTF-8 text
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from .constants import CODEC_CACHE_DIR
+
+# Any edit to the compiler (templates included) invalidates cached codecs
+COMPILER_DIGEST = hashlib.sha256(Path(__file__).read_bytes()).digest()
+IDL_DIR = Path(__file__).parent / "idl"
+ANCHOR_DISCRIMINATOR_SIZE = 8
+
+# IDL primitive -> (struct format, Python annotation)
+PRIMITIVES = {
+    "u8": ("B", "int"),
+    "i8": ("b", "int"),
+    "u16": ("H", "int"),
+    "i16": ("h", "int"),
+    "u32": ("I", "int"),
+    "i32": ("i", "int"),
+    "u64": ("Q", "int"),
+    "i64": ("q", "int"),
+    "bool": ("?", "bool"),
+    "publicKey": ("32s", "str"),
+    "pubkey": ("32s", "str"),
+    "u128": ("16s", "int"),
+    "i128": ("16s", "int"),
+}
+
+
+def event_discriminator(name: str) -> bytes:
+    """Anchor event discriminator: first 8 bytes of sha256("event:<Name>")."""
+    return hashlib.sha256(f"event:{name}".encode()).digest()[:ANCHOR_DISCRIMINATOR_SIZE]
+
+
+def snake_case(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _field_codec(field: dict[str, Any]) -> tuple[str, str, str, str]:
+    """Return (struct format or "string", annotation, decode and encode templates)."""
+    ftype = field["type"]
+    if ftype == "string":
+        return "string", "str", "{}", "{}.encode('utf-8')"
+    if isinstance(ftype, dict) and "array" in ftype:
+        item, length = ftype["array"]
+        if item != "u8":
+            raise ValueError(
+                f"Unsupported array item type {item!r} for field {field['name']!r}"
+            )
+        if field.get("utf8"):
+            return (
+                f"{length}s",
+                "str",
+                "{}.decode('utf-8').rstrip('\\x00')",
+                "{}.encode('utf-8')",
+            )
+        return f"{length}s", "bytes", "{}", "{}"
+    if ftype not in PRIMITIVES:
+        raise ValueError(f"Unsupported IDL type {ftype!r} for field {field['name']!r}")
+
+    fmt, annotation = PRIMITIVES[ftype]
+    if ftype in ("publicKey", "pubkey"):
+        return fmt, annotation, "_pubkey({})", "bytes(Pubkey.from_string({}))"
+    if ftype in ("u128", "i128"):
+        signed = ftype == "i128"
+        return (
+            fmt,
+            annotation,
+            f"int.from_bytes({{}}, 'little', signed={signed})",
+            f"{{}}.to_bytes(16, 'little', signed={signed})",
+        )
+    return fmt, annotation, "{}", "{}"
+
+
+def _field_line(field: dict[str, Any]) -> str:
+    """Dataclass attribute declaration for a field, with its IDL docs as a comment."""
+    docs = " ".join(field.get("docs", []))
+    return f"    {snake_case(field['name'])}: {_field_codec(field)[1]}" + (
+        f"  # {docs}" if docs else ""
+    )
+
+
+def _compile_event(
+    event: dict[str, Any], prefix: str, header: bytes
+) -> tuple[str, str, str]:
+    """Return (class name, decoder name, source) for one IDL event."""
+    class_name = prefix + event["name"]
+    const_name = "_" + snake_case(class_name).upper()
+    decoder_name = "decode_" + snake_case(class_name)
+    encoder_name = "encode_" + snake_case(class_name)
+
+    fields = []
+    # ("string", [var], [encode expr]) or (struct fmt, [vars], [encode exprs])
+    chunks: list[tuple[str, list[str], list[str]]] = []
+    args = []
+    for i, field in enumerate(event["fields"]):
+        fmt, _, conversion, encoding = _field_codec(field)
+        var = f"f{i}"
+        attr = snake_case(field["name"])
+        fields.append(_field_line(field))
+        args.append(conversion.format(var))
+        encoded = encoding.format(f"event.{attr}")
+        if fmt == "string":
+            chunks.append(("string", [var], [encoded]))
+        elif chunks and chunks[-1][0] != "string":
+            chunks[-1] = (
+                chunks[-1][0] + fmt,
+                chunks[-1][1] + [var],
+                chunks[-1][2] + [encoded],
+            )
+        else:
+            chunks.append((fmt, [var], [encoded]))
+
+    lines = ["@dataclass(slots=True)", f"class {class_name}:"]
+    lines += fields or ["    pass"]
+    lines.append("")
+    lines.append("")
+
+    body = [f"        offset = {len(header)}"]
+    encode_parts = [repr(header)] if header else []
+    for n, (fmt, vars_, exprs) in enumerate(chunks):
+        last = n == len(chunks) - 1
+        if fmt == "string":
+            encode_parts.append(f"_string({exprs[0]})")
+            body.append("        (length,) = _U32.unpack_from(data, offset)")
+            raw = "data[offset + 4:offset + 4 + length]"
+            body.append(f"        {vars_[0]} = bytes({raw}).decode('utf-8')")
+            if not last:
+                body.append("        offset += 4 + length")
+            continue
+        struct_name = f"{const_name}_{n}"
+        lines.append(f'{struct_name} = Struct("<{fmt}")')
+        encode_parts.append(f"{struct_name}.pack({', '.join(exprs)})")
+        targets = ", ".join(vars_) + ("," if len(vars_) == 1 else "")
+        body.append(f"        {targets} = {struct_name}.unpack_from(data, offset)")
+        if not last:
+            body.append(f"        offset += {struct_name}.size")
+
+    lines += [
+        "",
+        "",
+        f"def {decoder_name}(data: bytes) -> {class_name} | None:",
+        f'    """Decode a {class_name} from raw event bytes."""',
+        "    try:",
+        *body,
+        f"        return {class_name}({', '.join(args)})",
+        "    except Exception:",
+        "        return None",
+        "",
+        "",
+        f"def {encoder_name}(event: {class_name}) -> bytes:",
+        f'    """Encode a {class_name} to raw event bytes."""',
+        f"    return {' + '.join(encode_parts) or repr(b'')}",
+    ]
+    return class_name, decoder_name, "\n".join(lines)
+
+
+def compile_idl(idl: dict[str, Any], digest: str = "") -> str:
+    """Generate the source of a codec module for every event in an IDL."""
+    metadata = idl.get("metadata", {})
+    header = metadata.get("eventHeader", ANCHOR_DISCRIMINATOR_SIZE)
+    prefix = metadata.get("eventClassPrefix", "")
+
+    parts = [
+        f"# Generated from the {idl['name']} IDL by src/idl_compiler.py "
+        f"(sha256 {digest}). Do not edit.",
+        "from dataclasses import dataclass",
+        "from struct import Struct",
+        "",
+        "from solders.pubkey import Pubkey  # type: ignore",
+        "",
+        '_U32 = Struct("<I")',
+        "",
+        "",
+        "def _pubkey(raw: bytes) -> str:",
+        "    return str(Pubkey.from_bytes(raw))",
+        "",
+        "",
+        "def _string(value: bytes) -> bytes:",
+        "    return _U32.pack(len(value)) + value",
+    ]
+    classes, decoders, discriminators = [], [], []
+    for event in idl.get("events", []):
+        if header == ANCHOR_DISCRIMINATOR_SIZE:
+            header_bytes = event_discriminator(event["name"])
+        else:
+            header_bytes = bytes(header)
+        class_name, decoder_name, source = _compile_event(event, prefix, header_bytes)
+        parts += ["", "", source]
+        classes.append(class_name)
+        decoders.append((class_name, decoder_name))
+        if header == ANCHOR_DISCRIMINATOR_SIZE:
+            discriminators.append((event_discriminator(event["name"]), decoder_name))
+
+    parts += [
+        "",
+        "",
+        f"PROGRAM_ID = {metadata.get('address')!r}",
+        f"EVENT_CLASSES = ({', '.join(classes)}{',' if len(classes) == 1 else ''})",
+        "EVENT_DECODERS = {",
+        *(f"    {c!r}: {d}," for c, d in decoders),
+        "}",
+        "EVENT_ENCODERS = {",
+        *(f"    {c!r}: en{d[2:]}," for c, d in decoders),
+        "}",
+        "DISCRIMINATORS = {",
+        *(f"    {disc!r}: {d}," for disc, d in discriminators),
+        "}",
+        "",
+        "",
+        "def decode_event(data: bytes):",
+        '    """Decode by discriminator if possible, otherwise try each event in IDL '
+        'order."""',
+        f"    decoder = DISCRIMINATORS.get(bytes(data[:{ANCHOR_DISCRIMINATOR_SIZE}]))",
+        "    if decoder is not None:",
+        "        event = decoder(data)",
+        "        if event is not None:",
+        "            return event",
+        "    for decoder in EVENT_DECODERS.values():",
+        "        event = decoder(data)",
+        "        if event is not None:",
+        "            return event",
+        "    return None",
+        "",
+    ]
+    return "\n".join(parts)
+
+
+def compile_stub(idl: dict[str, Any]) -> str:
+    """Generate the type stub matching `compile_idl` for the same IDL."""
+    prefix = idl.get("metadata", {}).get("eventClassPrefix", "")
+    parts = [
+        f"# Generated from the {idl['name']} IDL by src/idl_compiler.py --stub. "
+        "Do not edit.",
+        "from dataclasses import dataclass",
+        "from typing import Any, Callable, Union",
+        "",
+    ]
+    classes = []
+    for event in idl.get("events", []):
+        class_name = prefix + event["name"]
+        name = snake_case(class_name)
+        classes.append(class_name)
+        parts += [
+            "@dataclass(slots=True)",
+            f"class {class_name}:",
+            *([_field_line(field) for field in event["fields"]] or ["    pass"]),
+            "",
+            f"def decode_{name}(data: bytes) -> {class_name} | None: ...",
+            f"def encode_{name}(event: {class_name}) -> bytes: ...",
+        ]
+    parts += [
+        "",
+        "AnyEvent = Union[",
+        *(f"    {c}," for c in classes),
+        "]",
+        "",
+        f"PROGRAM_ID: {'str' if idl.get('metadata', {}).get('address') else 'None'}",
+        "EVENT_CLASSES: tuple[type[AnyEvent], ...]",
+        "EVENT_DECODERS: dict[str, Callable[[bytes], AnyEvent | None]]",
+        "EVENT_ENCODERS: dict[str, Callable[[Any], bytes]]",
+        "DISCRIMINATORS: dict[bytes, Callable[[bytes], AnyEvent | None]]",
+        "",
+        "def decode_event(data: bytes) -> AnyEvent | None: ...",
+        "",
+    ]
+    return "\n".join(parts)
+
+
+def _exec_module(name: str, source: str, path: str) -> ModuleType:
+    module = ModuleType(name)
+    module.__file__ = path
+    sys.modules[name] = module
+    exec(compile(source, path, "exec"), module.__dict__)
+    return module
+
+
+def load_codecs(idl_path: Path, cache_dir: str = CODEC_CACHE_DIR) -> ModuleType:
+    """Import the codec module for an IDL, generating and caching it if needed."""
+    raw = idl_path.read_bytes()
+    digest = hashlib.sha256(COMPILER_DIGEST + raw).hexdigest()[:16]
+    name = f"_solana_codecs_{idl_path.stem}_{digest}"
+    if name in sys.modules:
+        return sys.modules[name]
+
+    path = os.path.join(cache_dir, f"{name}.py")
+    if not os.path.exists(path):
+        source = compile_idl(json.loads(raw), digest)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(source)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Codec cache unavailable ({e}); compiling {idl_path.name} in memory")
+            return _exec_module(name, source, str(idl_path))
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_protocol_codecs(protocol: str) -> ModuleType:
+    """Load the codecs for one of the bundled IDLs in `src/idl/`."""
+    return load_codecs(IDL_DIR / f"{protocol}.json")
+
+
+def event_fields(protocol: str) -> dict[str, dict[str, dict[str, Any]]]:
+    """Map each event class of a bundled IDL to its IDL fields, keyed by attribute."""
+    idl = json.loads((IDL_DIR / f"{protocol}.json").read_bytes())
+    prefix = idl.get("metadata", {}).get("eventClassPrefix", "")
+    return {
+        prefix
+        + event["name"]: {snake_case(field["name"]): field for field in event["fields"]}
+        for event in idl.get("events", [])
+    }
+
+
+if __name__ == "__main__":
+    # Print the generated module for an IDL:
+    #   python -m src.idl_compiler src/idl/pump.json
+    # or its stub:
+    #   python -m src.idl_compiler --stub src/idl/pump.json > src/pump_codecs.pyi
+    stub = sys.argv[1] == "--stub"
+    idl = json.loads(Path(sys.argv[-1]).read_bytes())
+    print(compile_stub(idl) if stub else compile_idl(idl), end="" if stub else "\n")
@@ -0,0 +1,65 @@
+# Generated from the jupiter IDL by src/idl_compiler.py --stub. Do not edit.
+from dataclasses import dataclass
+from typing import Any, Callable, Union
+
+@dataclass(slots=True)
+class JupiterCreatePoolEvent:
+    timestamp: int
+    index: int
+    creator: str
+    base_mint: str
+    quote_mint: str
+    base_mint_decimals: int
+    quote_mint_decimals: int
+    base_amount_in: int
+    quote_amount_in: int
+    pool_base_amount: int
+    pool_quote_amount: int
+    minimum_liquidity: int
+    initial_liquidity: int
+    lp_token_amount_out: int
+    pool_bump: int
+    pool: str
+    lp_mint: str
+    user_base_token_account: str
+    user_quote_token_account: str
+
+def decode_jupiter_create_pool_event(data: bytes) -> JupiterCreatePoolEvent | None: ...
+def encode_jupiter_create_pool_event(event: JupiterCreatePoolEvent) -> bytes: ...
+@dataclass(slots=True)
+class JupiterSwapEvent:
+    timestamp: int
+    index: int
+    creator: str
+    base_mint: str
+    quote_mint: str
+    base_mint_decimals: int
+    quote_mint_decimals: int
+    base_amount_in: int
+    quote_amount_in: int
+    pool_base_amount: int
+    pool_quote_amount: int
+    minimum_liquidity: int
+    initial_liquidity: int
+    lp_token_amount_out: int
+    pool_bump: int
+    pool: str
+    lp_mint: str
+    user_base_token_account: str
+    user_quote_token_account: str
+
+def decode_jupiter_swap_event(data: bytes) -> JupiterSwapEvent | None: ...
+def encode_jupiter_swap_event(event: JupiterSwapEvent) -> bytes: ...
+
+AnyEvent = Union[
+    JupiterCreatePoolEvent,
+    JupiterSwapEvent,
+]
+
+PROGRAM_ID: str
+EVENT_CLASSES: tuple[type[AnyEvent], ...]
+EVENT_DECODERS: dict[str, Callable[[bytes], AnyEvent | None]]
+EVENT_ENCODERS: dict[str, Callable[[Any], bytes]]
+DISCRIMINATORS: dict[bytes, Callable[[bytes], AnyEvent | None]]
+
+def decode_event(data: bytes) -> AnyEvent | None: ...
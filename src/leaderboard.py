@@ -0,0 +1,373 @@
+import hashlib
+import heapq
+import struct
+import threading
+import time
+from array import array
+from typing import Any, Callable, Optional
+
+from .checkpoint import array_from
+
+# Window name -> (window length in seconds, number of buckets in the ring)
+LEADERBOARD_WINDOWS = {
+    "1m": (60, 12),
+    "5m": (300, 30),
+    "60m": (3600, 60),
+}
+
+LEADERBOARD_KINDS = ("mint", "pool")
+LEADERBOARD_METRICS = ("volume", "trades")
+
+# Checkpoint headers: sketch dimensions, then per board the ring epoch
+CHECKPOINT_HEADER = struct.Struct("<II")
+EPOCH_HEADER = struct.Struct("<q")
+
+
+def sketch_indexes(key: str, depth: int, width: int) -> tuple[int, ...]:
+    """Return one flat table offset per sketch row for the given key."""
+    digest = hashlib.blake2b(key.encode(), digest_size=4 * depth).digest()
+    return tuple(
+        row * width + int.from_bytes(digest[4 * row : 4 * row + 4], "little") % width
+        for row in range(depth)
+    )
+
+
+class SlidingWindowSketch:
+    """Count-min sketch over a sliding time window, kept as a ring of bucket sketches.
+
+    The running window total is updated on every add and has expired buckets
+    subtracted from it on rotation, so estimates never touch the ring itself.
+    """
+
+    __slots__ = ("bucket_seconds", "num_buckets", "size", "buckets", "total", "epoch")
+
+    def __init__(self, window_seconds: int, num_buckets: int, depth: int, width: int):
+        self.bucket_seconds = window_seconds / num_buckets
+        self.num_buckets = num_buckets
+        self.size = depth * width
+        self.buckets = [array("d", bytes(8 * self.size)) for _ in range(num_buckets)]
+        self.total = array("d", bytes(8 * self.size))
+        self.epoch: Optional[int] = None
+
+    def advance(self, now: float) -> bool:
+        """Rotate the ring up to `now`; return True if any bucket expired."""
+        epoch = int(now // self.bucket_seconds)
+        if self.epoch is None:
+            self.epoch = epoch
+            return False
+        if epoch <= self.epoch:
+            return False
+
+        if epoch - self.epoch >= self.num_buckets:
+            zero = bytes(8 * self.size)
+            for i in range(self.num_buckets):
+                self.buckets[i] = array("d", zero)
+            self.total = array("d", zero)
+        else:
+            total = self.total
+            for e in range(self.epoch + 1, epoch + 1):
+                bucket = self.buckets[e % self.num_buckets]
+                for i, value in enumerate(bucket):
+                    if value:
+                        remaining = total[i] - value
+                        total[i] = remaining if remaining > 0 else 0.0
+                self.buckets[e % self.num_buckets] = array("d", bytes(8 * self.size))
+        self.epoch = epoch
+        return True
+
+    def add(self, indexes: tuple[int, ...], amount: float) -> float:
+        """Add `amount` for a key and return its updated window estimate."""
+        bucket = self.buckets[(self.epoch or 0) % self.num_buckets]
+        total = self.total
+        estimate = None
+        for i in indexes:
+            bucket[i] += amount
+            total[i] += amount
+            if estimate is None or total[i] < estimate:
+                estimate = total[i]
+        return estimate or 0.0
+
+    def estimate(self, indexes: tuple[int, ...]) -> float:
+        """Return the (over-)estimate for a key over the current window."""
+        total = self.total
+        return min(total[i] for i in indexes)
+
+
+class TopCandidates:
+    """Bounded set of heavy-hitter candidates with a lazily invalidated min-heap."""
+
+    __slots__ = ("capacity", "scores", "indexes", "heap")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.scores: dict[str, float] = {}
+        self.indexes: dict[str, tuple[int, ...]] = {}
+        self.heap: list[tuple[float, str]] = []
+
+    def offer(self, key: str, indexes: tuple[int, ...], score: float) -> None:
+        """Track `key` if it is already tracked or beats the current minimum."""
+        scores = self.scores
+        if key not in scores:
+            if len(scores) >= self.capacity:
+                self._drop_stale()
+                if not self.heap or score <= self.heap[0][0]:
+                    return
+                _, evicted = heapq.heappop(self.heap)
+                del scores[evicted]
+                del self.indexes[evicted]
+            self.indexes[key] = indexes
+        scores[key] = score
+        heapq.heappush(self.heap, (score, key))
+        if len(self.heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def refresh(self, estimate: Callable[[tuple[int, ...]], float]) -> None:
+        """Re-read every candidate's score after the window has moved."""
+        for key, indexes in self.indexes.items():
+            self.scores[key] = estimate(indexes)
+        self._rebuild_heap()
+
+    def top(self, n: int) -> list[tuple[str, float]]:
+        return heapq.nlargest(n, self.scores.items(), key=lambda item: item[1])
+
+    def _drop_stale(self) -> None:
+        heap, scores = self.heap, self.scores
+        while heap and scores.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def _rebuild_heap(self) -> None:
+        self.heap = [(score, key) for key, score in self.scores.items()]
+        heapq.heapify(self.heap)
+
+
+class WindowBoard:
+    """Volume and trade-count sketches plus top candidates for one kind and window."""
+
+    __slots__ = ("volume", "trades", "top_volume", "top_trades")
+
+    def __init__(
+        self,
+        window_seconds: int,
+        num_buckets: int,
+        depth: int,
+        width: int,
+        capacity: int,
+    ):
+        self.volume = SlidingWindowSketch(window_seconds, num_buckets, depth, width)
+        self.trades = SlidingWindowSketch(window_seconds, num_buckets, depth, width)
+        self.top_volume = TopCandidates(capacity)
+        self.top_trades = TopCandidates(capacity)
+
+    def advance(self, now: float) -> None:
+        if self.volume.advance(now) | self.trades.advance(now):
+            self.top_volume.refresh(self.volume.estimate)
+            self.top_trades.refresh(self.trades.estimate)
+
+    def record(self, key: str, indexes: tuple[int, ...], volume: int) -> None:
+        self.top_volume.offer(key, indexes, self.volume.add(indexes, volume))
+        self.top_trades.offer(key, indexes, self.trades.add(indexes, 1))
+
+
+def _pump_trade_keys(event: Any) -> list[tuple[str, str, int]]:
+    return [("mint", event.mint, event.sol_amount)]
+
+
+def _raydium_swap_keys(event: Any) -> list[tuple[str, str, int]]:
+    return [("pool", event.amm_id, event.amount_in)]
+
+
+def _jupiter_swap_keys(event: Any) -> list[tuple[str, str, int]]:
+    return [
+        ("mint", event.base_mint, event.base_amount_in),
+        ("mint", event.quote_mint, event.quote_amount_in),
+        ("pool", event.pool, event.base_amount_in),
+    ]
+
+
+# Keyed by class name so the leaderboard does not import the protocol layouts.
+TRADE_KEY_EXTRACTORS: dict[str, Callable[[Any], list[tuple[str, str, int]]]] = {
+    "PumpTradeEvent": _pump_trade_keys,
+    "RaydiumSwapEvent": _raydium_swap_keys,
+    "JupiterSwapEvent": _jupiter_swap_keys,
+}
+
+
+class Leaderboard:
+    """Rolling top-N mints and pools by volume and trade count.
+
+    Memory is fixed by the sketch dimensions and candidate capacity, no matter
+    how many distinct mints are seen. Volumes are raw on-chain amounts of the
+    traded side (lamports for pump.fun), so they are comparable per protocol only.
+    """
+
+    def __init__(
+        self,
+        windows: dict[str, tuple[int, int]] = LEADERBOARD_WINDOWS,
+        depth: int = 4,
+        width: int = 1024,
+        capacity: int = 256,
+    ):
+        self.depth = depth
+        self.width = width
+        self.boards = {
+            (kind, name): WindowBoard(seconds, buckets, depth, width, capacity)
+            for kind in LEADERBOARD_KINDS
+            for name, (seconds, buckets) in windows.items()
+        }
+        self.lock = threading.Lock()
+
+    def record(self, event: Any, now: Optional[float] = None) -> None:
+        """Feed a decoded event; non-trade events are ignored."""
+        extract = TRADE_KEY_EXTRACTORS.get(type(event).__name__)
+        if extract is None:
+            return
+        if now is None:
+            now = time.time()
+        for kind, key, volume in extract(event):
+            self.record_trade(kind, key, volume, now)
+
+    def record_trade(
+        self, kind: str, key: str, volume: int, now: Optional[float] = None
+    ) -> None:
+        """Count one trade of `volume` against `key` in every window of `kind`."""
+        if now is None:
+            now = time.time()
+        indexes = sketch_indexes(key, self.depth, self.width)
+        with self.lock:
+            for (board_kind, _), board in self.boards.items():
+                if board_kind != kind:
+                    continue
+                board.advance(now)
+                board.record(key, indexes, volume)
+
+    def top(
+        self,
+        kind: str = "mint",
+        window: str = "5m",
+        metric: str = "volume",
+        n: int = 10,
+        now: Optional[float] = None,
+    ) -> list[dict[str, Any]]:
+        """Return the top `n` keys for a kind, window and metric."""
+        board = self.boards.get((kind, window))
+        if board is None:
+            raise ValueError(f"Unknown leaderboard {kind!r}/{window!r}")
+        if metric not in LEADERBOARD_METRICS:
+            raise ValueError(f"Unknown leaderboard metric {metric!r}")
+        if now is None:
+            now = time.time()
+
+        with self.lock:
+            board.advance(now)
+            if metric == "volume":
+                ranked, other, other_name = board.top_volume, board.trades, "trades"
+            else:
+                ranked, other, other_name = board.top_trades, board.volume, "volume"
+            return [
+                {
+                    kind: key,
+                    metric: int(score),
+                    other_name: int(other.estimate(ranked.indexes[key])),
+                }
+                for key, score in ranked.top(n)
+                if score > 0
+            ]
+
+    def snapshot(self, n: int = 10, now: Optional[float] = None) -> dict[str, Any]:
+        """Return every leaderboard as a nested dict of kind -> window -> metric."""
+        if now is None:
+            now = time.time()
+        result: dict[str, Any] = {}
+        for kind, window in self.boards:
+            result.setdefault(kind, {})[window] = {
+                metric: self.top(kind, window, metric, n, now)
+                for metric in LEADERBOARD_METRICS
+            }
+        return result
+
+    def checkpoint_snapshot(self) -> Any:
+        with self.lock:
+            boards = [
+                (
+                    kind,
+                    window,
+                    board.volume.epoch,
+                    [bytes(board.volume.total), *map(bytes, board.volume.buckets)],
+                    [bytes(board.trades.total), *map(bytes, board.trades.buckets)],
+                    list(board.top_volume.scores),
+                    list(board.top_trades.scores),
+                )
+                for (kind, window), board in self.boards.items()
+            ]
+        return self.depth, self.width, boards
+
+    @staticmethod
+    def encode_checkpoint(snap: Any) -> list[bytes]:
+        depth, width, boards = snap
+        blobs = [CHECKPOINT_HEADER.pack(depth, width)]
+        for kind, window, epoch, volume, trades, top_volume, top_trades in boards:
+            blobs.append(f"{kind}/{window}/{len(volume) - 1}".encode())
+            blobs.append(EPOCH_HEADER.pack(-1 if epoch is None else epoch))
+            blobs.extend(volume)
+            blobs.extend(trades)
+            blobs.append("\n".join(top_volume).encode())
+            blobs.append("\n".join(top_trades).encode())
+        return blobs
+
+    def restore_checkpoint(self, blobs: list[memoryview]) -> None:
+        if CHECKPOINT_HEADER.unpack(blobs[0]) != (self.depth, self.width):
+            raise ValueError("Leaderboard sketch dimensions changed")
+
+        pos = 1
+        restored = []
+        while pos < len(blobs):
+            kind, window, buckets = bytes(blobs[pos]).decode().split("/")
+            num_buckets = int(buckets)
+            (epoch,) = EPOCH_HEADER.unpack(blobs[pos + 1])
+            sketch_blobs = blobs[pos + 2 : pos + 4 + 2 * num_buckets]
+            top_volume, top_trades = (
+                bytes(b).decode()
+                for b in blobs[pos + 4 + 2 * num_buckets : pos + 6 + 2 * num_buckets]
+            )
+            pos += 6 + 2 * num_buckets
+            board = self.boards.get((kind, window))
+            if board is None or board.volume.num_buckets != num_buckets:
+                continue
+            if any(len(b) != 8 * board.volume.size for b in sketch_blobs):
+                raise ValueError(f"Leaderboard {kind}/{window} sketch size mismatch")
+            restored.append((board, epoch, sketch_blobs, top_volume, top_trades))
+
+        with self.lock:
+            for board, epoch, sketch_blobs, top_volume, top_trades in restored:
+                volume_blobs = sketch_blobs[: len(sketch_blobs) // 2]
+                trades_blobs = sketch_blobs[len(sketch_blobs) // 2 :]
+                for sketch, sketch_blob in (
+                    (board.volume, volume_blobs),
+                    (board.trades, trades_blobs),
+                ):
+                    sketch.epoch = None if epoch < 0 else epoch
+                    sketch.total = array_from("d", sketch_blob[0])
+                    sketch.buckets = [array_from("d", b) for b in sketch_blob[1:]]
+                for candidates, sketch, keys in (
+                    (board.top_volume, board.volume, top_volume),
+                    (board.top_trades, board.trades, top_trades),
+                ):
+                    candidates.scores.clear()
+                    candidates.indexes.clear()
+                    for key in filter(None, keys.split("\n")):
+                        candidates.indexes[key] = sketch_indexes(
+                            key, self.depth, self.width
+                        )
+                    candidates.refresh(sketch.estimate)
+
+    def query(self, params: dict[str, str]) -> Any:
+        """Query API handler: `/leaderboard?kind=mint&window=5m&metric=volume&n=10`."""
+        n = int(params.get("n", 10))
+        if "kind" not in params and "window" not in params and "metric" not in params:
+            return self.snapshot(n)
+        return self.top(
+            params.get("kind", "mint"),
+            params.get("window", "5m"),
+            params.get("metric", "volume"),
+            n,
+        )
@@ -0,0 +1,152 @@
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .base58 import pubkey_bytes
+
+# Checkpoint layout: header, fixed-width reserve records (32-byte key, two
+# reserves, timestamp) and length-prefixed UTF-8 signatures
+CHECKPOINT_VERSION = 2
+CHECKPOINT_HEADER = struct.Struct("<Iq")  # format version, last slot
+RESERVES_RECORD = struct.Struct("<32sQQq")
+MAX_SIGNATURE_LENGTH = 255
+
+
+class MarketState:
+    """Latest derived per-market state plus the ingest position.
+
+    Tracks pump.fun bonding-curve virtual reserves per mint, Raydium pool
+    reserves per AMM id, the highest slot seen and a window of recent
+    transaction signatures used to drop duplicate notifications (the same
+    transaction arrives once per matching subscription). Markets are keyed by
+    their 32-byte pubkey, which is also how they are checkpointed.
+    """
+
+    def __init__(self, max_markets: int = 500_000, dedup_window: int = 20_000):
+        self.max_markets = max_markets
+        self.dedup_window = dedup_window
+        self.last_slot = -1
+        self.curves: OrderedDict[bytes, tuple[int, int, int]] = OrderedDict()
+        self.pools: OrderedDict[bytes, tuple[int, int, int]] = OrderedDict()
+        self.signatures: OrderedDict[str, None] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def observe(self, slot: Optional[int], signature: Optional[str]) -> bool:
+        """Record a notification; return False if its signature was already seen."""
+        with self.lock:
+            if slot is not None and slot > self.last_slot:
+                self.last_slot = slot
+            # Signatures that could not be checkpointed are processed without dedup
+            if (
+                not signature
+                or not isinstance(signature, str)
+                or len(signature) > MAX_SIGNATURE_LENGTH
+            ):
+                return True
+            if signature in self.signatures:
+                return False
+            self.signatures[signature] = None
+            if len(self.signatures) > self.dedup_window:
+                self.signatures.popitem(last=False)
+            return True
+
+    def record(self, event: Any) -> None:
+        """Update curve or pool reserves from a decoded event."""
+        name = type(event).__name__
+        if name == "PumpTradeEvent":
+            self._put(
+                self.curves,
+                event.mint,
+                (
+                    event.virtual_sol_reserves,
+                    event.virtual_token_reserves,
+                    event.timestamp,
+                ),
+            )
+        elif name in ("RaydiumSwapEvent", "RaydiumLiquidityEvent"):
+            self._put(
+                self.pools,
+                event.amm_id,
+                (event.base_reserve_after, event.quote_reserve_after, event.timestamp),
+            )
+
+    def _put(
+        self, table: OrderedDict, pubkey: str, value: tuple[int, int, int]
+    ) -> None:
+        try:
+            key = pubkey_bytes(pubkey)
+        except (TypeError, ValueError):
+            return
+        with self.lock:
+            table[key] = value
+            table.move_to_end(key)
+            if len(table) > self.max_markets:
+                table.popitem(last=False)
+
+    def checkpoint_snapshot(self) -> Any:
+        with self.lock:
+            return (
+                self.last_slot,
+                self.curves.copy(),
+                self.pools.copy(),
+                list(self.signatures),
+            )
+
+    @staticmethod
+    def encode_checkpoint(snap: Any) -> list[bytes]:
+        last_slot, curves, pools, signatures = snap
+        blobs = [CHECKPOINT_HEADER.pack(CHECKPOINT_VERSION, last_slot)]
+        pack = RESERVES_RECORD.pack
+        for table in (curves, pools):
+            try:
+                blobs.append(
+                    b"".join([pack(key, *value) for key, value in table.items()])
+                )
+            except struct.error:
+                # Out-of-range reserves are rare; only then pay for a per-record check
+                items = [(k, v) for k, v in table.items() if _packable(v)]
+                blobs.append(b"".join([pack(key, *value) for key, value in items]))
+        encoded = bytearray()
+        for sig in signatures:
+            try:
+                raw = sig.encode()
+            except UnicodeEncodeError:
+                continue
+            if len(raw) <= MAX_SIGNATURE_LENGTH:
+                encoded += bytes([len(raw)]) + raw
+        blobs.append(bytes(encoded))
+        return blobs
+
+    def restore_checkpoint(self, blobs: list[memoryview]) -> None:
+        header_blob, curves_blob, pools_blob, signatures_blob = blobs
+        version, last_slot = CHECKPOINT_HEADER.unpack(header_blob)
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported market state format {version}")
+        curves, pools = (
+            OrderedDict(
+                (key, (a, b, ts)) for key, a, b, ts in RESERVES_RECORD.iter_unpack(blob)
+            )
+            for blob in (curves_blob, pools_blob)
+        )
+        signatures: OrderedDict[str, None] = OrderedDict()
+        offset = 0
+        while offset < len(signatures_blob):
+            end = offset + 1 + signatures_blob[offset]
+            if end > len(signatures_blob):
+                raise ValueError("Truncated signature record")
+            signatures[bytes(signatures_blob[offset + 1 : end]).decode()] = None
+            offset = end
+        with self.lock:
+            self.last_slot = last_slot
+            self.curves = curves
+            self.pools = pools
+            self.signatures = signatures
+
+
+def _packable(value: tuple[int, int, int]) -> bool:
+    try:
+        RESERVES_RECORD.pack(bytes(32), *value)
+    except struct.error:
+        return False
+    return True
@@ -0,0 +1,389 @@
+"""On-demand profiling of the live ingest path.
+
+A capture runs for N seconds and is started with SIGUSR1 (cProfile), SIGUSR2
+(stack sampling) or `GET /profile` on the query API. Nothing is installed
+while idle: hook points are ordinary attributes (`ws.on_message`,
+`EventProcessor.process_logs`, ...) that are wrapped for the capture window
+and restored afterwards, and the sampler thread only exists during a capture.
+
+Each capture writes to PROFILE_DIR:
+  <stamp>-cprofile.prof       pstats dump (cprofile mode)
+  <stamp>-sample.folded       folded stacks (sample mode)
+  <stamp>-<mode>-summary.txt  time per decoder, handler and state component
+  <stamp>-<mode>-memory.txt   tracemalloc diff over the window
+"""
+import cProfile
+import io
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from types import CodeType, FrameType
+from typing import Any, Optional
+
+from .constants import (
+    PROFILE_DIR,
+    PROFILE_MAX_SECONDS,
+    PROFILE_SAMPLE_INTERVAL,
+    PROFILE_SECONDS,
+)
+
+PROFILE_MODES = ("cprofile", "sample")
+SUMMARY_TOP = 30
+MEMORY_TOP = 40
+
+# Frames that mark a sampled stack as being inside the ingest path
+INGEST_FUNCTIONS = {"on_message", "process_logs", "handle_event"}
+
+
+def attribution_label(filename: str, name: str, qualname: str = "") -> Optional[str]:
+    """Group a function as a decoder, handler, parser or state component, or None.
+
+    State methods share names across classes (`record`), so they are labelled
+    with `qualname` when given.
+    """
+    if name.startswith("decode_"):
+        return f"decoder  {name}"
+    if name.startswith("_handle_"):
+        return f"handler  {name}"
+    if name in ("loads", "b64decode"):
+        return f"parse    {name}"
+    if name in ("record", "publish", "observe"):
+        module = os.path.splitext(os.path.basename(filename))[0]
+        return f"state    {module}.{qualname or name}"
+    return None
+
+
+@dataclass
+class Capture:
+    mode: str
+    seconds: float
+    memory: bool
+    prefix: str
+    started: float = field(default_factory=time.time)
+    memory_before: Optional[tracemalloc.Snapshot] = None
+    started_tracemalloc: bool = False
+
+    def info(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "seconds": self.seconds,
+            "memory": self.memory,
+            "started": self.started,
+            "output": self.prefix,
+        }
+
+
+class Profiler:
+    """Runs one cProfile or sampling capture at a time over registered hook points."""
+
+    def __init__(
+        self,
+        output_dir: str = PROFILE_DIR,
+        sample_interval: float = PROFILE_SAMPLE_INTERVAL,
+    ):
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.hooks: dict[str, tuple[Any, str]] = {}
+        self.capture: Optional[Capture] = None
+        self.lock = threading.Lock()
+        # Only populated during a cprofile capture
+        self._wrapped: list[tuple[Any, str, Any, bool]] = []
+        self._profiles: dict[int, cProfile.Profile] = {}
+        self._local = threading.local()
+
+    def hook(self, name: str, obj: Any, attr: str) -> None:
+        """Register `obj.attr` as hook point `name`, replacing any earlier one."""
+        with self.lock:
+            self.hooks[name] = (obj, attr)
+            if self.capture is not None and self.capture.mode == "cprofile":
+                self._wrap(obj, attr)
+
+    def start(
+        self,
+        seconds: Optional[float] = None,
+        mode: str = "cprofile",
+        memory: bool = True,
+    ) -> dict[str, Any]:
+        """Begin a capture in the background; raise ValueError if one is running."""
+        seconds = PROFILE_SECONDS if seconds is None else seconds
+        if mode not in PROFILE_MODES:
+            raise ValueError(
+                f"Unknown mode {mode!r}; expected one of {', '.join(PROFILE_MODES)}"
+            )
+        if not 0 < seconds <= PROFILE_MAX_SECONDS:
+            raise ValueError(f"seconds must be in (0, {PROFILE_MAX_SECONDS}]")
+
+        with self.lock:
+            if self.capture is not None:
+                raise ValueError(f"A {self.capture.mode} capture is already running")
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            capture = Capture(
+                mode, seconds, memory, os.path.join(self.output_dir, f"{stamp}-{mode}")
+            )
+            if memory:
+                capture.started_tracemalloc = not tracemalloc.is_tracing()
+                if capture.started_tracemalloc:
+                    tracemalloc.start()
+                capture.memory_before = tracemalloc.take_snapshot()
+            if mode == "cprofile":
+                for obj, attr in self.hooks.values():
+                    self._wrap(obj, attr)
+            self.capture = capture
+
+        threading.Thread(
+            target=self._run, args=(capture,), name="profiler", daemon=True
+        ).start()
+        print(f"Profiling ({mode}) for {seconds:g}s -> {capture.prefix}*")
+        return capture.info()
+
+    def query(self, params: dict[str, str]) -> dict[str, Any]:
+        """Query API handler: /profile?seconds=30&mode=cprofile|sample&memory=1"""
+        try:
+            seconds = float(params["seconds"]) if "seconds" in params else None
+        except ValueError:
+            raise ValueError("seconds must be a number")
+        return self.start(
+            seconds, params.get("mode", "cprofile"), params.get("memory", "1") != "0"
+        )
+
+    def install_signal_handlers(self) -> None:
+        """SIGUSR1 starts a cProfile capture, SIGUSR2 a sampling one (main thread)."""
+        if not hasattr(signal, "SIGUSR1"):
+            return
+        for signum, mode in ((signal.SIGUSR1, "cprofile"), (signal.SIGUSR2, "sample")):
+            # Start from a thread so the handler never waits on a lock held by the
+            # interrupted code
+            signal.signal(
+                signum,
+                lambda *_, mode=mode: threading.Thread(
+                    target=self._start_quietly, args=(mode,)
+                ).start(),
+            )
+
+    def _start_quietly(self, mode: str) -> None:
+        try:
+            self.start(mode=mode)
+        except ValueError as e:
+            print(f"Profiling not started: {e}")
+
+    def _wrap(self, obj: Any, attr: str) -> None:
+        original = getattr(obj, attr)
+        profiles, local = self._profiles, self._local
+
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            # Hooks nest (on_message -> process_logs); the outermost toggles profiling
+            if getattr(local, "active", False):
+                return original(*args, **kwargs)
+            profile = profiles.get(threading.get_ident())
+            if profile is None:
+                profile = profiles.setdefault(threading.get_ident(), cProfile.Profile())
+            local.active = True
+            profile.enable()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                profile.disable()
+                local.active = False
+
+        had_attr = attr in getattr(obj, "__dict__", {})
+        setattr(obj, attr, profiled)
+        self._wrapped.append((obj, attr, original, had_attr))
+
+    def _unwrap(self) -> None:
+        for obj, attr, original, had_attr in reversed(self._wrapped):
+            if had_attr:
+                setattr(obj, attr, original)
+            else:
+                delattr(obj, attr)
+        self._wrapped = []
+
+    def _run(self, capture: Capture) -> None:
+        samples = None
+        if capture.mode == "sample":
+            # The sampler needs the GIL to read other threads' stacks; a shorter switch
+            # interval lets it in during CPU-bound stretches, not only when the ingest
+            # thread does I/O
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(switch_interval, self.sample_interval))
+            try:
+                samples = self._sample(capture)
+            finally:
+                sys.setswitchinterval(switch_interval)
+        else:
+            time.sleep(capture.seconds)
+
+        with self.lock:
+            self._unwrap()
+            profiles, self._profiles = list(self._profiles.values()), {}
+            memory_after = tracemalloc.take_snapshot() if capture.memory else None
+            if capture.started_tracemalloc:
+                tracemalloc.stop()
+            self.capture = None
+
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            if samples is not None:
+                files = self._write_samples(capture, *samples)
+            else:
+                files = self._write_cprofile(capture, profiles)
+            if memory_after is not None and capture.memory_before is not None:
+                files.append(
+                    self._write_memory(capture, capture.memory_before, memory_after)
+                )
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+            return
+        print(f"Profile written: {', '.join(files)}")
+
+    def _sample(self, capture: Capture) -> tuple[Counter, Counter, Counter, int, int]:
+        """Sample every other thread's stack until the capture ends."""
+        me = threading.get_ident()
+        stacks: Counter = Counter()
+        self_counts: Counter = Counter()
+        inclusive_counts: Counter = Counter()
+        total = ingest = 0
+        deadline = time.monotonic() + capture.seconds
+        while time.monotonic() < deadline:
+            for thread_id, top in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack: list[CodeType] = []
+                frame: Optional[FrameType] = top
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                total += 1
+                if not any(code.co_name in INGEST_FUNCTIONS for code in stack):
+                    continue
+                ingest += 1
+                stack.reverse()
+                stacks[
+                    ";".join(
+                        f"{os.path.basename(c.co_filename)}:{c.co_qualname}"
+                        for c in stack
+                    )
+                ] += 1
+                labels = [
+                    label
+                    for c in stack
+                    if (
+                        label := attribution_label(
+                            c.co_filename, c.co_name, c.co_qualname
+                        )
+                    )
+                ]
+                if labels:
+                    self_counts[labels[-1]] += 1
+                    inclusive_counts.update(set(labels))
+            time.sleep(self.sample_interval)
+        return stacks, self_counts, inclusive_counts, total, ingest
+
+    def _write_samples(
+        self,
+        capture: Capture,
+        stacks: Counter,
+        self_counts: Counter,
+        inclusive_counts: Counter,
+        total: int,
+        ingest: int,
+    ) -> list[str]:
+        folded = f"{capture.prefix}.folded"
+        with open(folded, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        interval_ms = self.sample_interval * 1000
+        lines = [
+            f"Sampling profile over {capture.seconds:g}s every {interval_ms:g} ms",
+            f"{ingest} of {total} thread samples were inside the ingest path",
+            "(samples land more often in calls that release the GIL, such as writes;"
+            " use cprofile for exact times)",
+            "",
+            f"{'inclusive':>10} {'self':>8}  component",
+        ]
+        samples = max(ingest, 1)
+        for label, count in inclusive_counts.most_common():
+            share = self_counts[label] / samples
+            lines.append(f"{count / samples:>10.1%} {share:>8.1%}  {label}")
+        lines += ["", "Hottest stacks:"]
+        for stack, count in stacks.most_common(10):
+            lines.append(f"{count / samples:>7.1%}  {stack.rsplit(';', 4)[-4:]}")
+        summary = f"{capture.prefix}-summary.txt"
+        with open(summary, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        return [folded, summary]
+
+    def _write_cprofile(
+        self, capture: Capture, profiles: list[cProfile.Profile]
+    ) -> list[str]:
+        summary = f"{capture.prefix}-summary.txt"
+        if not profiles:
+            with open(summary, "w") as f:
+                f.write(
+                    f"No messages were handled during the {capture.seconds:g}s"
+                    " capture\n"
+                )
+            return [summary]
+
+        out = io.StringIO()
+        stats = pstats.Stats(*profiles, stream=out)
+        dump = f"{capture.prefix}.prof"
+        stats.dump_stats(dump)
+
+        rows: dict[str, list[float]] = {}
+        # Stats.stats and total_tt are undocumented but stable; typeshed omits them
+        entries = stats.stats.items()  # type: ignore[attr-defined]
+        for (filename, line, name), (_, ncalls, tottime, cumtime, _) in entries:
+            label = attribution_label(filename, name, f"{name}:{line}")
+            if label is None:
+                continue
+            row = rows.setdefault(label, [0, 0.0, 0.0])
+            row[0] += ncalls
+            row[1] += tottime
+            row[2] += cumtime
+
+        total_tt = stats.total_tt  # type: ignore[attr-defined]
+        out.write(
+            f"cProfile over {capture.seconds:g}s of {total_tt:.3f}s"
+            " in the ingest path\n\n"
+        )
+        out.write(
+            f"{'calls':>10} {'self s':>9} {'cum s':>9} {'cum us/call':>12}  component\n"
+        )
+        for label, (ncalls, tottime, cumtime) in sorted(
+            rows.items(), key=lambda item: -item[1][2]
+        ):
+            per_call_us = cumtime / ncalls * 1e6
+            out.write(
+                f"{ncalls:>10} {tottime:>9.4f} {cumtime:>9.4f} {per_call_us:>12.1f}"
+                f"  {label}\n"
+            )
+        out.write("\n")
+        stats.sort_stats("cumulative").print_stats(SUMMARY_TOP)
+        with open(summary, "w") as f:
+            f.write(out.getvalue())
+        return [dump, summary]
+
+    def _write_memory(
+        self,
+        capture: Capture,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+    ) -> str:
+        diff = after.compare_to(before, "lineno")
+        path = f"{capture.prefix}-memory.txt"
+        with open(path, "w") as f:
+            f.write(
+                f"tracemalloc diff over {capture.seconds:g}s"
+                " (allocations still live at the end)\n"
+            )
+            f.write(f"net {sum(stat.size_diff for stat in diff) / 1024:+.1f} KiB\n\n")
+            for stat in diff[:MEMORY_TOP]:
+                f.write(f"{stat}\n")
+        return path
@@ -0,0 +1,47 @@
+import importlib
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Iterable, Optional
+
+from .constants import (
+    ENABLED_PROTOCOLS,
+    JUPITER_PROGRAM_ID,
+    PUMP_FUN_PROGRAM_ID,
+    RAYDIUM_V4_PROGRAM_ID,
+)
+
+
+@dataclass(frozen=True)
+class Protocol:
+    """A supported program; its layout module (and codecs) are imported on `load`."""
+
+    name: str
+    display_name: str
+    program_id: str
+    layout_module: str
+
+    def load(self) -> ModuleType:
+        return importlib.import_module(f".{self.layout_module}", __package__)
+
+
+PROTOCOLS = {
+    "jupiter": Protocol("jupiter", "Jupiter", JUPITER_PROGRAM_ID, "jupiter_layout"),
+    "pump": Protocol("pump", "pump.fun", PUMP_FUN_PROGRAM_ID, "pump_layout"),
+    "raydium": Protocol(
+        "raydium", "Raydium V4", RAYDIUM_V4_PROGRAM_ID, "raydium_layout"
+    ),
+}
+
+
+def enabled_protocols(names: Optional[Iterable[str]] = None) -> list[Protocol]:
+    """Resolve protocol names (default: ENABLED_PROTOCOLS) to registry entries."""
+    if names is None:
+        names = ENABLED_PROTOCOLS
+    protocols = []
+    for name in names:
+        if name not in PROTOCOLS:
+            raise ValueError(
+                f"Unknown protocol {name!r}; expected one of {', '.join(PROTOCOLS)}"
+            )
+        protocols.append(PROTOCOLS[name])
+    return protocols
@@ -0,0 +1,51 @@
+# Generated from the pump IDL by src/idl_compiler.py --stub. Do not edit.
+from dataclasses import dataclass
+from typing import Any, Callable, Union
+
+@dataclass(slots=True)
+class PumpCreateEvent:
+    name: str
+    symbol: str
+    uri: str
+    mint: str
+    bonding_curve: str
+    user: str
+
+def decode_pump_create_event(data: bytes) -> PumpCreateEvent | None: ...
+def encode_pump_create_event(event: PumpCreateEvent) -> bytes: ...
+@dataclass(slots=True)
+class PumpTradeEvent:
+    mint: str
+    sol_amount: int
+    token_amount: int
+    is_buy: bool
+    user: str
+    timestamp: int
+    virtual_sol_reserves: int
+    virtual_token_reserves: int
+
+def decode_pump_trade_event(data: bytes) -> PumpTradeEvent | None: ...
+def encode_pump_trade_event(event: PumpTradeEvent) -> bytes: ...
+@dataclass(slots=True)
+class PumpCompleteEvent:
+    user: str
+    mint: str
+    bonding_curve: str
+    timestamp: int
+
+def decode_pump_complete_event(data: bytes) -> PumpCompleteEvent | None: ...
+def encode_pump_complete_event(event: PumpCompleteEvent) -> bytes: ...
+
+AnyEvent = Union[
+    PumpCreateEvent,
+    PumpTradeEvent,
+    PumpCompleteEvent,
+]
+
+PROGRAM_ID: str
+EVENT_CLASSES: tuple[type[AnyEvent], ...]
+EVENT_DECODERS: dict[str, Callable[[bytes], AnyEvent | None]]
+EVENT_ENCODERS: dict[str, Callable[[Any], bytes]]
+DISCRIMINATORS: dict[bytes, Callable[[bytes], AnyEvent | None]]
+
+def decode_event(data: bytes) -> AnyEvent | None: ...
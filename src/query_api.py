@@ -0,0 +1,75 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from .constants import QUERY_API_HOST, QUERY_API_PORT
+
+QueryHandler = Callable[[dict[str, str]], Any]
+
+
+class QueryServer:
+    """Local read-only JSON API over in-memory scraper state.
+
+    Each route maps a path to a handler taking the query string as a dict and
+    returning something JSON serializable. A handler raising ValueError
+    produces a 400 response.
+    """
+
+    def __init__(self, host: str = QUERY_API_HOST, port: int = QUERY_API_PORT):
+        self.host = host
+        self.port = port
+        self.routes: dict[str, QueryHandler] = {}
+        self.httpd: Optional[ThreadingHTTPServer] = None
+
+    def route(self, path: str, handler: QueryHandler) -> None:
+        self.routes[path] = handler
+
+    def start(self) -> None:
+        """Serve in a daemon thread; safe to call more than once."""
+        if self.httpd is not None:
+            return
+        routes = self.routes
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                url = urlsplit(self.path)
+                handler = routes.get(url.path)
+                if handler is None:
+                    self._reply(404, {"error": f"Unknown path {url.path}"})
+                    return
+                try:
+                    self._reply(200, handler(dict(parse_qsl(url.query))))
+                except ValueError as e:
+                    self._reply(400, {"error": str(e)})
+                except Exception as e:
+                    self._reply(500, {"error": str(e)})
+
+            def _reply(self, status: int, body: Any) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        try:
+            self.httpd = ThreadingHTTPServer((self.host, self.port), RequestHandler)
+        except OSError as e:
+            print(f"Query API disabled, cannot bind {self.host}:{self.port}: {e}")
+            return
+        self.httpd.daemon_threads = True
+        threading.Thread(
+            target=self.httpd.serve_forever, name="query-api", daemon=True
+        ).start()
+        print(f"Query API listening on http://{self.host}:{self.port}")
+
+    def stop(self) -> None:
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
@@ -0,0 +1,70 @@
+# Generated from the raydium IDL by src/idl_compiler.py --stub. Do not edit.
+from dataclasses import dataclass
+from typing import Any, Callable, Union
+
+@dataclass(slots=True)
+class RaydiumInitPoolEvent:
+    nonce: int
+    open_time: int
+    init_pc_amount: int
+    init_coin_amount: int
+    base_mint: str
+    quote_mint: str
+    lp_mint: str
+    amm_id: str
+    amm_authority: str
+    amm_open_orders: str
+    amm_target_orders: str
+    pool_coin_token_account: str
+    pool_pc_token_account: str
+    pool_withdraw_queue: str
+    pool_lp_token_account: str
+    serum_market: str
+
+def decode_raydium_init_pool_event(data: bytes) -> RaydiumInitPoolEvent | None: ...
+def encode_raydium_init_pool_event(event: RaydiumInitPoolEvent) -> bytes: ...
+@dataclass(slots=True)
+class RaydiumSwapEvent:
+    amm_id: str
+    user: str
+    direction: int  # 0 = base to quote, 1 = quote to base
+    amount_in: int
+    amount_out: int
+    fee_amount: int
+    base_reserve_before: int
+    quote_reserve_before: int
+    base_reserve_after: int
+    quote_reserve_after: int
+    timestamp: int
+
+def decode_raydium_swap_event(data: bytes) -> RaydiumSwapEvent | None: ...
+def encode_raydium_swap_event(event: RaydiumSwapEvent) -> bytes: ...
+@dataclass(slots=True)
+class RaydiumLiquidityEvent:
+    amm_id: str
+    user: str
+    is_deposit: bool  # True for deposit, False for withdraw
+    base_amount: int
+    quote_amount: int
+    lp_amount: int
+    base_reserve_after: int
+    quote_reserve_after: int
+    lp_supply_after: int
+    timestamp: int
+
+def decode_raydium_liquidity_event(data: bytes) -> RaydiumLiquidityEvent | None: ...
+def encode_raydium_liquidity_event(event: RaydiumLiquidityEvent) -> bytes: ...
+
+AnyEvent = Union[
+    RaydiumInitPoolEvent,
+    RaydiumSwapEvent,
+    RaydiumLiquidityEvent,
+]
+
+PROGRAM_ID: str
+EVENT_CLASSES: tuple[type[AnyEvent], ...]
+EVENT_DECODERS: dict[str, Callable[[bytes], AnyEvent | None]]
+EVENT_ENCODERS: dict[str, Callable[[Any], bytes]]
+DISCRIMINATORS: dict[bytes, Callable[[bytes], AnyEvent | None]]
+
+def decode_event(data: bytes) -> AnyEvent | None: ...
@@ -0,0 +1,166 @@
+"""Subscription transport: permessage-deflate (RFC 7692) and wire accounting.
+
+websocket-client rejects frames with RSV1 set and has no compression support,
+so after the handshake `attach` swaps the connection's frame buffer for one
+that strips RSV1, inflates each frame of a compressed message as it arrives
+and counts payload bytes on the wire. Outgoing frames stay uncompressed, which
+the RFC allows.
+
+This relies on websocket-client internals (`frame_buffer`, `WebSocket._recv`),
+hence the narrow version range in pyproject.toml. If they change, `attach`
+raises and `wss.on_open` reconnects without offering the extension.
+"""
+import re
+import zlib
+from typing import TYPE_CHECKING, Any, Optional, cast
+
+import websocket
+
+try:
+    from websocket._abnf import frame_buffer
+
+    HAS_FRAME_BUFFER = True
+except ImportError:
+    if not TYPE_CHECKING:
+        frame_buffer = object
+    HAS_FRAME_BUFFER = False  # attach() refuses to run
+
+# Sent with the handshake; servers without the extension simply ignore it
+DEFLATE_OFFER = "Sec-WebSocket-Extensions: permessage-deflate; client_max_window_bits"
+DEFLATE_TAIL = (
+    b"\x00\x00\xff\xff"  # removed by the sender from every compressed message
+)
+
+OPCODE_CONT, OPCODE_TEXT, OPCODE_BINARY = 0x0, 0x1, 0x2
+
+# `"err":` before `"logs"` in a logsNotification; anything but null is a failed
+# transaction
+ERR_VALUE = re.compile(r'"err"\s*:\s*(\S)')
+
+
+def parse_deflate_response(extensions: Optional[str]) -> Optional[dict[str, str]]:
+    """Return the accepted permessage-deflate parameters, or None if not negotiated."""
+    for offer in (extensions or "").split(","):
+        name, *params = [part.strip() for part in offer.split(";")]
+        if name == "permessage-deflate":
+            return dict((param.split("=", 1) + [""])[:2] for param in params if param)
+    return None
+
+
+def is_failed_transaction(message: str) -> bool:
+    """True if a logsNotification carries `value.err != null`, without parsing logs.
+
+    The RPC serializes `err` ahead of `logs`; a match after `"logs"` is inside a
+    log line, and the message is left to the JSON path.
+    """
+    match = ERR_VALUE.search(message)
+    if match is None:
+        return False
+    logs_at = message.find('"logs"')
+    if logs_at != -1 and match.start() > logs_at:
+        return False
+    return match.group(1) != "n"
+
+
+class TransportStats:
+    """Counters for the subscription stream, exposed on the query API."""
+
+    def __init__(self) -> None:
+        self.compressed = False
+        self.frames = 0
+        self.wire_bytes = 0  # frame payloads as received (compressed if negotiated)
+        self.message_bytes = 0  # payloads after inflating
+        self.messages = 0
+        self.failed_skipped = 0
+        self.events = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "permessage_deflate": self.compressed,
+            "frames": self.frames,
+            "messages": self.messages,
+            "wire_bytes": self.wire_bytes,
+            "message_bytes": self.message_bytes,
+            "compression_ratio": round(self.message_bytes / self.wire_bytes, 3)
+            if self.wire_bytes
+            else None,
+            "failed_skipped": self.failed_skipped,
+            "events": self.events,
+            "wire_bytes_per_event": round(self.wire_bytes / self.events, 1)
+            if self.events
+            else None,
+        }
+
+    def query(self, params: dict[str, str]) -> dict[str, Any]:
+        return self.snapshot()
+
+
+class DeflateFrameBuffer(frame_buffer):
+    """frame_buffer that inflates permessage-deflate messages frame by frame."""
+
+    def __init__(
+        self, recv_fn: Any, stats: TransportStats, deflate: Optional[dict[str, str]]
+    ) -> None:
+        # utf-8 is still checked when run_forever decodes the (inflated) text message
+        super().__init__(recv_fn, skip_utf8_validation=True)
+        self.stats = stats
+        self.deflate = deflate
+        self.reset_context = (
+            deflate is not None and "server_no_context_takeover" in deflate
+        )
+        self.inflater = (
+            zlib.decompressobj(-zlib.MAX_WBITS) if deflate is not None else None
+        )
+        self.rsv1 = 0
+        self.inflating = False  # inside a fragmented compressed message
+
+    def recv_header(self) -> None:
+        super().recv_header()
+        assert self.header is not None
+        fin, rsv1, rsv2, rsv3, opcode, has_mask, length_bits = self.header
+        self.rsv1 = rsv1
+        self.header = (fin, 0, rsv2, rsv3, opcode, has_mask, length_bits)
+
+    def recv_frame(self) -> Any:
+        frame = super().recv_frame()
+        if frame.opcode not in (OPCODE_CONT, OPCODE_TEXT, OPCODE_BINARY):
+            return frame
+
+        stats = self.stats
+        stats.frames += 1
+        stats.wire_bytes += len(frame.data)
+        if self.rsv1 and frame.opcode != OPCODE_CONT:
+            if self.inflater is None:
+                raise zlib.error(
+                    "compressed frame without negotiated permessage-deflate"
+                )
+            self.inflating = True
+        if self.inflating:
+            inflater = self.inflater
+            assert inflater is not None
+            data = inflater.decompress(cast(bytes, frame.data))
+            if frame.fin:
+                data += inflater.decompress(DEFLATE_TAIL)
+                self.inflating = False
+                if self.reset_context:
+                    self.inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+            frame.data = data
+        stats.message_bytes += len(frame.data)
+        return frame
+
+
+def attach(sock: Any, stats: TransportStats) -> bool:
+    """Install the inflating frame buffer on `sock`; return whether deflate is on.
+
+    Call from `on_open`: the handshake has completed and no frame has been read yet.
+    """
+    if not HAS_FRAME_BUFFER or not hasattr(sock, "frame_buffer"):
+        raise RuntimeError(
+            f"websocket-client {websocket.__version__} has no replaceable frame buffer"
+        )
+    deflate = parse_deflate_response(
+        (sock.getheaders() or {}).get("sec-websocket-extensions")
+    )
+    sock.frame_buffer = DeflateFrameBuffer(sock._recv, stats, deflate)
+    stats.compressed = deflate is not None
+    return stats.compressed
@@ -0,0 +1,309 @@
+import struct
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from .base58 import b58encode, pubkey_bytes
+from .checkpoint import array_from
+
+# Event class name -> kind code stored in the log
+EVENT_KINDS = (
+    "JupiterCreatePoolEvent",
+    "JupiterSwapEvent",
+    "PumpCreateEvent",
+    "PumpTradeEvent",
+    "PumpCompleteEvent",
+    "RaydiumSwapEvent",
+    "RaydiumLiquidityEvent",
+)
+_KIND_CODES = {name: code for code, name in enumerate(EVENT_KINDS)}
+
+# Checkpoint header: log capacity, next sequence number
+CHECKPOINT_HEADER = struct.Struct("<Qq")
+
+# Event class name -> (wallet, mint, amount). Raydium events carry no mint, so
+# the AMM id is indexed in its place.
+WALLET_KEY_EXTRACTORS: dict[str, Callable[[Any], tuple[str, str, int]]] = {
+    "JupiterCreatePoolEvent": lambda e: (e.creator, e.base_mint, e.base_amount_in),
+    "JupiterSwapEvent": lambda e: (e.creator, e.base_mint, e.base_amount_in),
+    "PumpCreateEvent": lambda e: (e.user, e.mint, 0),
+    "PumpTradeEvent": lambda e: (e.user, e.mint, e.sol_amount),
+    "PumpCompleteEvent": lambda e: (e.user, e.mint, 0),
+    "RaydiumSwapEvent": lambda e: (e.user, e.amm_id, e.amount_in),
+    "RaydiumLiquidityEvent": lambda e: (e.user, e.amm_id, e.base_amount),
+}
+
+
+class EventLog:
+    """Fixed-capacity ring of compact event records stored in parallel arrays.
+
+    Records are addressed by a monotonically increasing sequence number; a
+    reference is valid while its slot has not been overwritten. The arrays grow
+    one record at a time until they hold `capacity` records, so an idle index
+    costs nothing to build or checkpoint.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.next_seq = 0
+        self.seqs = array("q")
+        self.timestamps = array("d")
+        self.kinds = array("B")
+        self.amounts = array("Q")
+        self.wallets = bytearray()
+        self.mints = bytearray()
+
+    def append(
+        self, timestamp: float, kind: int, wallet: bytes, mint: bytes, amount: int
+    ) -> int:
+        seq = self.next_seq
+        self.next_seq += 1
+        slot = seq % self.capacity
+        if slot == len(self.seqs):
+            self.seqs.append(seq)
+            self.timestamps.append(timestamp)
+            self.kinds.append(kind)
+            self.amounts.append(amount)
+            self.wallets += wallet
+            self.mints += mint
+            return seq
+        self.seqs[slot] = seq
+        self.timestamps[slot] = timestamp
+        self.kinds[slot] = kind
+        self.amounts[slot] = amount
+        self.wallets[32 * slot : 32 * slot + 32] = wallet
+        self.mints[32 * slot : 32 * slot + 32] = mint
+        return seq
+
+    def alive(self, seq: int) -> bool:
+        return self.seqs[seq % self.capacity] == seq
+
+    def timestamp(self, seq: int) -> float:
+        return self.timestamps[seq % self.capacity]
+
+    def wallet(self, seq: int) -> bytes:
+        slot = seq % self.capacity
+        return bytes(self.wallets[32 * slot : 32 * slot + 32])
+
+    def mint(self, seq: int) -> bytes:
+        slot = seq % self.capacity
+        return bytes(self.mints[32 * slot : 32 * slot + 32])
+
+    def record(self, seq: int) -> dict[str, Any]:
+        slot = seq % self.capacity
+        return {
+            "seq": seq,
+            "timestamp": self.timestamps[slot],
+            "event": EVENT_KINDS[self.kinds[slot]],
+            "wallet": b58encode(self.wallets[32 * slot : 32 * slot + 32]),
+            "mint": b58encode(self.mints[32 * slot : 32 * slot + 32]),
+            "amount": self.amounts[slot],
+        }
+
+
+class RecentRing:
+    """Per-key ring of the most recent event sequence numbers, oldest overwritten first.
+
+    The backing array grows on demand up to `capacity`, so quiet keys stay small.
+    """
+
+    __slots__ = ("capacity", "seqs", "count")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.seqs = array("q")
+        self.count = 0
+
+    def push(self, seq: int) -> None:
+        if len(self.seqs) < self.capacity:
+            self.seqs.append(seq)
+        else:
+            self.seqs[self.count % self.capacity] = seq
+        self.count += 1
+
+    def newest_first(self) -> list[int]:
+        cap = self.capacity
+        return [
+            self.seqs[i % cap]
+            for i in range(self.count - 1, max(self.count - cap, 0) - 1, -1)
+        ]
+
+
+class KeyIndex:
+    """Bounded map of 32-byte keys to RecentRings; evicts the least recently active key.
+
+    The dict holds the single bytes object kept per key; the event log stores
+    keys inline, so no per-event key objects are retained.
+    """
+
+    def __init__(self, max_keys: int, per_key_cap: int):
+        self.max_keys = max_keys
+        self.per_key_cap = per_key_cap
+        self.rings: OrderedDict[bytes, RecentRing] = OrderedDict()
+
+    def push(self, key: bytes, seq: int) -> None:
+        ring = self.rings.get(key)
+        if ring is None:
+            if len(self.rings) >= self.max_keys:
+                self.rings.popitem(last=False)
+            ring = self.rings[key] = RecentRing(self.per_key_cap)
+        else:
+            self.rings.move_to_end(key)
+        ring.push(seq)
+
+    def newest_first(self, key: bytes) -> list[int]:
+        ring = self.rings.get(key)
+        return ring.newest_first() if ring is not None else []
+
+
+class WalletIndex:
+    """In-memory inverted index from wallets (and mints) to their recent events.
+
+    Memory is bounded by `max_events` records in the shared log, plus at most
+    `max_wallets` / `max_mints` rings of `per_wallet_cap` / `per_mint_cap`
+    references. References to records that have been overwritten are skipped.
+    """
+
+    def __init__(
+        self,
+        max_events: int = 500_000,
+        max_wallets: int = 200_000,
+        per_wallet_cap: int = 64,
+        max_mints: int = 50_000,
+        per_mint_cap: int = 256,
+    ):
+        self.log = EventLog(max_events)
+        self.wallets = KeyIndex(max_wallets, per_wallet_cap)
+        self.mints = KeyIndex(max_mints, per_mint_cap)
+        self.lock = threading.Lock()
+
+    def record(self, event: Any, now: Optional[float] = None) -> None:
+        """Index a decoded event; events without a wallet are ignored."""
+        name = type(event).__name__
+        extract = WALLET_KEY_EXTRACTORS.get(name)
+        if extract is None:
+            return
+        if now is None:
+            now = time.time()
+        wallet, mint, amount = extract(event)
+        try:
+            wallet_key = pubkey_bytes(wallet)
+            mint_key = pubkey_bytes(mint)
+        except ValueError:
+            return
+
+        with self.lock:
+            seq = self.log.append(now, _KIND_CODES[name], wallet_key, mint_key, amount)
+            self.wallets.push(wallet_key, seq)
+            self.mints.push(mint_key, seq)
+
+    def checkpoint_snapshot(self) -> Any:
+        log = self.log
+        with self.lock:
+            return (
+                log.capacity,
+                log.next_seq,
+                [
+                    bytes(log.seqs),
+                    bytes(log.timestamps),
+                    bytes(log.kinds),
+                    bytes(log.amounts),
+                    bytes(log.wallets),
+                    bytes(log.mints),
+                ],
+            )
+
+    @staticmethod
+    def encode_checkpoint(snap: Any) -> list[bytes]:
+        capacity, next_seq, arrays = snap
+        return [CHECKPOINT_HEADER.pack(capacity, next_seq), *arrays]
+
+    def restore_checkpoint(self, blobs: list[memoryview]) -> None:
+        """Load the event log and rebuild the wallet and mint rings from it."""
+        capacity, next_seq = CHECKPOINT_HEADER.unpack(blobs[0])
+        if capacity != self.log.capacity:
+            raise ValueError("Wallet index capacity changed")
+        seqs, timestamps, kinds, amounts, wallets, mints = blobs[1:]
+        records = len(kinds)
+        if not min(next_seq, capacity) <= records <= capacity:
+            raise ValueError("Wallet index log size mismatch")
+        if len(wallets) != 32 * records or len(mints) != 32 * records:
+            raise ValueError("Wallet index log size mismatch")
+        if not len(seqs) == len(timestamps) == len(amounts) == 8 * records:
+            raise ValueError("Wallet index log size mismatch")
+
+        with self.lock:
+            log = self.log
+            log.next_seq = next_seq
+            log.seqs = array_from("q", seqs)
+            log.timestamps = array_from("d", timestamps)
+            log.kinds = array_from("B", kinds)
+            log.amounts = array_from("Q", amounts)
+            log.wallets = bytearray(wallets)
+            log.mints = bytearray(mints)
+            self.wallets.rings.clear()
+            self.mints.rings.clear()
+            for seq in range(max(next_seq - capacity, 0), next_seq):
+                if log.alive(seq):
+                    self.wallets.push(log.wallet(seq), seq)
+                    self.mints.push(log.mint(seq), seq)
+
+    def _live(self, seqs: list[int]) -> list[int]:
+        return [seq for seq in seqs if self.log.alive(seq)]
+
+    def last_trades(self, wallet: str, n: int = 20) -> list[dict[str, Any]]:
+        """Return up to `n` most recent events for a wallet, newest first."""
+        key = pubkey_bytes(wallet)
+        with self.lock:
+            return [
+                self.log.record(seq)
+                for seq in self._live(self.wallets.newest_first(key))[:n]
+            ]
+
+    def mints_touched(self, wallet: str) -> list[str]:
+        """Return the distinct mints in a wallet's retained events, newest first."""
+        key = pubkey_bytes(wallet)
+        with self.lock:
+            mints = dict.fromkeys(
+                self.log.mint(seq) for seq in self._live(self.wallets.newest_first(key))
+            )
+        return [b58encode(mint) for mint in mints]
+
+    def wallets_for_mint(
+        self, mint: str, window: float = 300, now: Optional[float] = None
+    ) -> list[str]:
+        """Return distinct wallets active on a mint in the last `window` seconds."""
+        key = pubkey_bytes(mint)
+        if now is None:
+            now = time.time()
+        since = now - window
+        with self.lock:
+            wallets: dict[bytes, None] = {}
+            for seq in self._live(self.mints.newest_first(key)):
+                if self.log.timestamp(seq) < since:
+                    break
+                wallets.setdefault(self.log.wallet(seq), None)
+        return [b58encode(wallet) for wallet in wallets]
+
+    def query_wallet(self, params: dict[str, str]) -> Any:
+        """Query API handler: `/wallet?wallet=<pubkey>&n=20`."""
+        if "wallet" not in params:
+            raise ValueError("Missing 'wallet' parameter")
+        return {
+            "wallet": params["wallet"],
+            "trades": self.last_trades(params["wallet"], int(params.get("n", 20))),
+            "mints": self.mints_touched(params["wallet"]),
+        }
+
+    def query_mint_wallets(self, params: dict[str, str]) -> Any:
+        """Query API handler: `/mint/wallets?mint=<pubkey>&window=300`."""
+        if "mint" not in params:
+            raise ValueError("Missing 'mint' parameter")
+        return {
+            "mint": params["mint"],
+            "wallets": self.wallets_for_mint(
+                params["mint"], float(params.get("window", 300))
+            ),
+        }
@@ -3,29 +3,47 @@ import json
 import time
 
 from .event_processor import EventProcessor
-from .constants import JUPITER_PROGRAM_ID, PUMP_FUN_PROGRAM_ID, RAYDIUM_V4_PROGRAM_ID, WSS_ENDPOINT
+from .protocols import PROTOCOLS
+from .transport import DEFLATE_OFFER, TransportStats, attach, is_failed_transaction
+from .constants import WSS_ENDPOINT, EVENT_RING_ENABLED, SKIP_FAILED_TRANSACTIONS, WS_PERMESSAGE_DEFLATE
 
 WSS = WSS_ENDPOINT
 
 event_processor = EventProcessor()
 
+transport_stats = TransportStats()
+# Cleared for good if the inflating frame buffer cannot be installed on this websocket-client
+offer_deflate = WS_PERMESSAGE_DEFLATE
+
 def on_message(ws, message):
+    transport_stats.messages += 1
+    if SKIP_FAILED_TRANSACTIONS and is_failed_transaction(message):
+        transport_stats.failed_skipped += 1
+        return
+
     try:
         log_data = json.loads(message)
     except json.JSONDecodeError as e:
         print(f"JSON decode error: {e}")
         return
     
-    logs = log_data.get("params", {}) \
-                   .get("result", {}) \
-                   .get("value", {}) \
-                   .get("logs", [])
+    result = log_data.get("params", {}).get("result", {})
+    value = result.get("value", {})
+    if SKIP_FAILED_TRANSACTIONS and value.get("err") is not None:
+        transport_stats.failed_skipped += 1
+        return
+    logs = value.get("logs", [])
 
     if not logs:
         return
+
+    # The same transaction is delivered once per subscription it matches
+    if not event_processor.market_state.observe(result.get("context", {}).get("slot"), value.get("signature")):
+        return
     
     event = event_processor.process_logs(logs)
     if event:
+        transport_stats.events += 1
         event_processor.handle_event(event)
 
 def on_error(ws, error):
@@ -35,61 +53,97 @@ def on_close(ws, close_status_code, close_msg):
     print("WebSocket connection closed")
 
 def on_open(ws):
-    # Subscribe to Jupiter program
-    jupiter_request = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "logsSubscribe",
-        "params": [
-            {"mentions": [JUPITER_PROGRAM_ID]},
-            {"commitment": "processed"},
-        ],
-    }
-    
-    # Subscribe to pump.fun program
-    pump_request = {
-        "jsonrpc": "2.0",
-        "id": 2,
-        "method": "logsSubscribe",
-        "params": [
-            {"mentions": [PUMP_FUN_PROGRAM_ID]},
-            {"commitment": "processed"},
-        ],
-    }
-    
-    # Subscribe to Raydium V4 program
-    raydium_request = {
-        "jsonrpc": "2.0",
-        "id": 3,
-        "method": "logsSubscribe",
-        "params": [
-            {"mentions": [RAYDIUM_V4_PROGRAM_ID]},
-            {"commitment": "processed"},
-        ],
-    }
-    
+    global offer_deflate
     try:
-        ws.send(json.dumps(jupiter_request))
-        print("Subscribed to Jupiter logs...")
-        ws.send(json.dumps(pump_request))
-        print("Subscribed to pump.fun logs...")
-        ws.send(json.dumps(raydium_request))
-        print("Subscribed to Raydium V4 logs...")
+        if attach(ws.sock, transport_stats):
+            print("Negotiated permessage-deflate")
     except Exception as e:
-        print(f"Error sending subscription request: {e}")
+        # Without the offer the server sends plain frames, which the stock frame buffer reads
+        print(f"Cannot install the permessage-deflate frame buffer: {e}")
+        if offer_deflate:
+            print("Reconnecting without permessage-deflate...")
+            offer_deflate = False
+            ws.close()
+            return
+    # Subscribe to each enabled program; request ids follow the registry order
+    for request_id, protocol in enumerate(PROTOCOLS.values(), start=1):
+        if protocol.name not in event_processor.layouts:
+            continue
+        request = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "logsSubscribe",
+            "params": [
+                {"mentions": [protocol.program_id]},
+                {"commitment": "processed"},
+            ],
+        }
+        try:
+            ws.send(json.dumps(request))
+            print(f"Subscribed to {protocol.display_name} logs...")
+        except Exception as e:
+            print(f"Error sending subscription request: {e}")
+            return
 
 def start_websocket():
-    while True:
-        ws = websocket.WebSocketApp(
-            WSS,
-            on_message=on_message,
-            on_error=on_error,
-            on_close=on_close
-        )
-        ws.on_open = on_open
-        ws.run_forever()
-        print("WebSocket connection lost. Reconnecting in 1 second...")
-        time.sleep(1)
+    # Built here rather than at import so that importing this module stays cheap
+    from .checkpoint import Checkpointer
+    from .profiler import Profiler
+    from .query_api import QueryServer
+
+    leaderboard, wallet_index = event_processor.start_tracking()
+    checkpointer = Checkpointer({
+        "market_state": event_processor.market_state,
+        "leaderboard": leaderboard,
+        "wallet_index": wallet_index,
+    })
+
+    query_server = QueryServer()
+    query_server.route("/leaderboard", leaderboard.query)
+    query_server.route("/wallet", wallet_index.query_wallet)
+    query_server.route("/mint/wallets", wallet_index.query_mint_wallets)
+    query_server.route("/transport", transport_stats.query)
+
+    # Wrapped only while a capture runs; the connection's on_message is hooked per connection
+    profiler = Profiler()
+    profiler.hook("process_logs", event_processor, "process_logs")
+    profiler.hook("handle_event", event_processor, "handle_event")
+    query_server.route("/profile", profiler.query)
+
+    checkpointer.load()
+    checkpointer.start()
+    query_server.start()
+    profiler.install_signal_handlers()
+    if EVENT_RING_ENABLED and event_processor.event_ring is None:
+        from .event_ring import EventRingWriter
+
+        try:
+            event_processor.event_ring = EventRingWriter()
+        except (OSError, RuntimeError) as e:
+            print(f"Not publishing to the event ring: {e}")
+        else:
+            print(f"Publishing decoded events to {event_processor.event_ring.path}")
+    try:
+        while True:
+            ws = websocket.WebSocketApp(
+                WSS,
+                on_message=on_message,
+                on_error=on_error,
+                on_close=on_close,
+                header=[DEFLATE_OFFER] if offer_deflate else None,
+            )
+            ws.on_open = on_open
+            profiler.hook("on_message", ws, "on_message")
+            ws.run_forever()
+            print("WebSocket connection lost. Reconnecting in 1 second...")
+            time.sleep(1)
+    finally:
+        try:
+            checkpointer.stop()
+        finally:
+            if event_processor.event_ring is not None:
+                event_processor.event_ring.close()
+                event_processor.event_ring = None
 
 if __name__ == "__main__":
     try:
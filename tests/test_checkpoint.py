@@ -0,0 +1,246 @@
+from dataclasses import dataclass
+
+import pytest
+
+from src.checkpoint import MAGIC, Checkpointer
+
+
+class Blobs:
+    """Minimal checkpointable component holding a list of byte strings."""
+
+    def __init__(self, blobs=()):
+        self.blobs = list(blobs)
+
+    def checkpoint_snapshot(self):
+        return list(self.blobs)
+
+    @staticmethod
+    def encode_checkpoint(snap):
+        return snap
+
+    def restore_checkpoint(self, blobs):
+        self.blobs = [bytes(b) for b in blobs]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "state.ckpt")
+
+
+def save(path, **components):
+    Checkpointer(components, path).save()
+
+
+def test_round_trip(path):
+    save(path, a=Blobs([b"one", b"", b"three"]), b=Blobs([b"x" * 1000]))
+    a, b = Blobs(), Blobs()
+    assert Checkpointer({"a": a, "b": b}, path).load()
+    assert a.blobs == [b"one", b"", b"three"]
+    assert b.blobs == [b"x" * 1000]
+
+
+def test_missing_file_is_a_cold_start(path):
+    assert not Checkpointer({"a": Blobs()}, path).load()
+
+
+@pytest.mark.parametrize("size", [len(MAGIC) + 1, len(MAGIC) + 5, 20, 40])
+def test_truncated_file_is_a_cold_start(path, size):
+    save(path, a=Blobs([b"payload" * 10]))
+    with open(path, "r+b") as f:
+        f.truncate(size)
+    a = Blobs()
+    assert not Checkpointer({"a": a}, path).load()
+    assert a.blobs == []
+
+
+def test_garbage_after_magic_is_a_cold_start(path):
+    with open(path, "wb") as f:
+        f.write(MAGIC + b"\x05\xff\xfe\xfd\xfc\xfb" + bytes(range(256)))
+    assert not Checkpointer({"a": Blobs()}, path).load()
+
+
+def test_sections_before_a_torn_tail_are_kept(path):
+    save(path, a=Blobs([b"kept"]), b=Blobs([b"lost" * 100]))
+    with open(path, "r+b") as f:
+        f.seek(0, 2)
+        f.truncate(f.tell() - 10)
+    a, b = Blobs(), Blobs()
+    assert Checkpointer({"a": a, "b": b}, path).load()
+    assert a.blobs == [b"kept"]
+    assert b.blobs == []
+
+
+def test_corrupt_section_is_skipped(path):
+    save(path, a=Blobs([b"first"]), b=Blobs([b"second"]))
+    data = bytearray(open(path, "rb").read())
+    data[data.index(b"first")] ^= 0xFF
+    open(path, "wb").write(data)
+    a, b = Blobs(), Blobs()
+    assert Checkpointer({"a": a, "b": b}, path).load()
+    assert a.blobs == []
+    assert b.blobs == [b"second"]
+
+
+def test_failed_final_save_is_logged(tmp_path, capsys):
+    checkpointer = Checkpointer(
+        {"a": Blobs([b"x"])}, str(tmp_path / "missing" / "state.ckpt")
+    )
+    checkpointer.start()
+    checkpointer.stop()
+    assert "Checkpoint failed" in capsys.readouterr().out
+
+
+@dataclass
+class PumpTradeEvent:
+    mint: str
+    virtual_sol_reserves: int
+    virtual_token_reserves: int
+    timestamp: int
+
+
+@dataclass
+class RaydiumSwapEvent:
+    amm_id: str
+    base_reserve_after: int
+    quote_reserve_after: int
+    timestamp: int
+
+
+def test_market_state_round_trip(path):
+    from src.base58 import b58encode
+    from src.market_state import MarketState
+
+    state = MarketState()
+    mint, pool = b58encode(bytes([1]) * 32), b58encode(bytes([2]) * 32)
+    signatures = [b58encode(bytes([n]) * 64) for n in range(3)] + [
+        "not-base58-0OIl",
+        "1" * 70,
+    ]
+    for n, signature in enumerate(signatures):
+        assert state.observe(100 + n, signature)
+    state.record(PumpTradeEvent(mint, 1, 2, 3))
+    state.record(RaydiumSwapEvent(pool, 4, 5, 6))
+    save(path, market_state=state)
+
+    restored = MarketState()
+    assert Checkpointer({"market_state": restored}, path).load()
+    assert restored.last_slot == 104
+    assert restored.curves == {bytes([1]) * 32: (1, 2, 3)}
+    assert restored.pools == {bytes([2]) * 32: (4, 5, 6)}
+    assert list(restored.signatures) == signatures
+    assert not restored.observe(105, signatures[3])
+
+
+def test_market_state_bad_keys_do_not_abort_checkpoint(path):
+    from src.market_state import MarketState
+
+    state = MarketState()
+    state.observe(1, "valid-signature")
+    state.signatures["\ud800"] = None  # lone surrogate from JSON; not UTF-8 encodable
+    state.record(PumpTradeEvent("not a pubkey", 1, 2, 3))  # ignored
+    state.curves[bytes(32)] = (
+        -1,
+        2,
+        3,
+    )  # reserves that do not fit the record are dropped
+    state.curves[bytes([1]) * 32] = (1, 2, 3)
+    save(path, market_state=state)
+
+    restored = MarketState()
+    assert Checkpointer({"market_state": restored}, path).load()
+    assert list(restored.signatures) == ["valid-signature"]
+    assert restored.curves == {bytes([1]) * 32: (1, 2, 3)}
+
+
+def test_market_state_skips_uncheckpointable_signatures():
+    from src.market_state import MarketState
+
+    state = MarketState()
+    for _ in range(2):
+        assert state.observe(1, "x" * 300)
+        assert state.observe(1, 12345)
+    assert len(state.signatures) == 0
+
+
+def test_leaderboard_round_trip(path):
+    from src.leaderboard import Leaderboard
+
+    windows = {"1m": (60, 12), "5m": (300, 30)}
+    board = Leaderboard(windows=windows, width=64, capacity=4)
+    board.record_trade("mint", "a", 500, now=10)
+    board.record_trade("mint", "b", 100, now=40)
+    board.record_trade("pool", "p", 7, now=40)
+    save(path, leaderboard=board)
+
+    restored = Leaderboard(windows=windows, width=64, capacity=4)
+    assert Checkpointer({"leaderboard": restored}, path).load()
+    assert restored.snapshot(now=45) == board.snapshot(now=45)
+    # Expiry continues from the restored ring position
+    assert [row["mint"] for row in restored.top("mint", "1m", now=70)] == ["b"]
+
+
+def test_leaderboard_dimension_change_is_skipped(path):
+    from src.leaderboard import Leaderboard
+
+    board = Leaderboard(width=64)
+    board.record_trade("mint", "a", 1, now=0)
+    save(path, leaderboard=board)
+    assert not Checkpointer({"leaderboard": Leaderboard(width=128)}, path).load()
+
+
+def test_wallet_index_round_trip(path):
+    from dataclasses import dataclass
+
+    from src.base58 import b58encode
+    from src.wallet_index import WalletIndex
+
+    @dataclass
+    class PumpTradeEvent:
+        user: str
+        mint: str
+        sol_amount: int
+
+    wallet, mint = b58encode(bytes([1]) * 32), b58encode(bytes([2]) * 32)
+    index = WalletIndex(max_events=4)
+    for amount in range(6):  # wraps the log
+        index.record(PumpTradeEvent(wallet, mint, amount), now=amount)
+    save(path, wallet_index=index)
+
+    restored = WalletIndex(max_events=4)
+    assert Checkpointer({"wallet_index": restored}, path).load()
+    assert restored.last_trades(wallet) == index.last_trades(wallet)
+    assert [t["amount"] for t in restored.last_trades(wallet)] == [5, 4, 3, 2]
+    assert restored.wallets_for_mint(mint, window=10, now=6) == [wallet]
+    restored.record(PumpTradeEvent(wallet, mint, 6), now=6)
+    assert restored.last_trades(wallet, n=1)[0]["seq"] == 6
+
+    # A log that has not filled up yet is saved and restored at its current size
+    partial = WalletIndex(max_events=4)
+    partial.record(PumpTradeEvent(wallet, mint, 1), now=1)
+    save(path, wallet_index=partial)
+    restored = WalletIndex(max_events=4)
+    assert Checkpointer({"wallet_index": restored}, path).load()
+    for amount in range(2, 7):
+        restored.record(PumpTradeEvent(wallet, mint, amount), now=amount)
+    assert [t["amount"] for t in restored.last_trades(wallet)] == [6, 5, 4, 3]
+
+
+def test_all_components_share_one_file(path):
+    from src.leaderboard import Leaderboard
+    from src.market_state import MarketState
+    from src.wallet_index import WalletIndex
+
+    def components():
+        return {
+            "market_state": MarketState(),
+            "leaderboard": Leaderboard(width=64),
+            "wallet_index": WalletIndex(max_events=8),
+        }
+
+    saved = components()
+    saved["market_state"].observe(9, "sig")
+    Checkpointer(saved, path).save()
+
+    restored = components()
+    assert Checkpointer(restored, path).load()
+    assert restored["market_state"].last_slot == 9
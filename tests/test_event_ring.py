@@ -0,0 +1,192 @@
+import subprocess
+import sys
+from dataclasses import dataclass
+
+import pytest
+
+from src.base58 import b58encode
+from src.event_ring import EventRingReader, EventRingWriter
+
+
+@dataclass
+class PumpCompleteEvent:
+    user: str
+    mint: str
+    bonding_curve: str
+    timestamp: int
+
+
+@dataclass
+class UnknownEvent:
+    timestamp: int
+
+
+def key(n: int) -> str:
+    return b58encode(bytes([n]) * 32)
+
+
+def complete(n: int) -> PumpCompleteEvent:
+    return PumpCompleteEvent(key(n), key(n + 1), key(n + 2), n)
+
+
+@pytest.fixture
+def ring(tmp_path):
+    writer = EventRingWriter(str(tmp_path / "events.ring"), capacity=4)
+    yield writer
+    writer.close()
+
+
+def test_round_trip(ring):
+    reader = EventRingReader(ring.path)
+    assert ring.publish(complete(1), recv_time=12.5)
+
+    record = reader.read()
+    assert (record.seq, record.recv_time, record.event_type) == (
+        0,
+        12.5,
+        "PumpCompleteEvent",
+    )
+    assert record.decode() == {
+        "user": key(1),
+        "mint": key(2),
+        "bonding_curve": key(3),
+        "timestamp": 1,
+    }
+    assert reader.is_current(record)
+    assert reader.read() is None
+    assert reader.lag() == 0
+    del record  # payload views pin the mapping
+    reader.close()
+
+
+def test_reader_starts_at_head_unless_from_start(ring):
+    for n in range(3):
+        ring.publish(complete(n))
+
+    assert EventRingReader(ring.path).read() is None
+    assert [r.seq for r in EventRingReader(ring.path, from_start=True)] == [0, 1, 2]
+
+
+def test_overrun_skips_to_oldest_intact_record(ring):
+    reader = EventRingReader(ring.path)
+    for n in range(10):
+        ring.publish(complete(n))
+
+    assert reader.lag() == 10
+    records = list(reader)
+    assert [r.seq for r in records] == [6, 7, 8, 9]
+    assert [r.decode()["timestamp"] for r in records] == [6, 7, 8, 9]
+    assert reader.dropped == 6
+
+    ring.publish(complete(10))
+    assert reader.read().seq == 10
+    assert reader.dropped == 6
+
+
+def test_record_overwritten_while_held_is_not_current(ring):
+    reader = EventRingReader(ring.path)
+    ring.publish(complete(0))
+    record = reader.read()
+
+    for n in range(1, 5):
+        ring.publish(complete(n))
+    assert not reader.is_current(record)
+    assert [r.seq for r in reader] == [1, 2, 3, 4]
+    assert reader.dropped == 0
+
+
+def test_unencodable_events_are_not_published(ring):
+    reader = EventRingReader(ring.path)
+    assert not ring.publish(UnknownEvent(1))
+    assert not ring.publish(PumpCompleteEvent("not a key", key(1), key(2), 0))
+    assert ring.next_seq == 0
+
+    assert ring.publish(complete(1))
+    assert [r.seq for r in reader] == [0]
+
+
+def test_single_writer(ring):
+    with pytest.raises(RuntimeError, match="already has a writer"):
+        EventRingWriter(ring.path, capacity=4)
+
+
+def test_reopened_writer_keeps_cursor(tmp_path):
+    path = str(tmp_path / "events.ring")
+    writer = EventRingWriter(path, capacity=4)
+    writer.publish(complete(0))
+    writer.close()
+
+    writer = EventRingWriter(path, capacity=4)
+    assert writer.next_seq == 1
+    writer.close()
+
+    writer = EventRingWriter(path, capacity=8)  # new geometry starts over
+    assert writer.next_seq == 0
+    writer.close()
+
+
+def test_reader_follows_recreated_ring(tmp_path):
+    path = str(tmp_path / "events.ring")
+    writer = EventRingWriter(path, capacity=4)
+    writer.publish(complete(0))
+    reader = EventRingReader(path, from_start=True)
+    writer.close()
+
+    writer = EventRingWriter(path, capacity=4)
+    writer.mm[:8] = bytes(8)  # force a new generation on the next open
+    writer.close()
+    writer = EventRingWriter(path, capacity=4)
+
+    assert reader.read() is None
+    writer.publish(complete(5))
+    assert [r.decode()["timestamp"] for r in reader] == [5]
+    writer.close()
+
+
+def test_reader_remaps_when_ring_shrinks(tmp_path):
+    path = str(tmp_path / "events.ring")
+    writer = EventRingWriter(path, capacity=64)
+    reader = EventRingReader(path)
+    writer.close()
+
+    writer = EventRingWriter(
+        path, capacity=4
+    )  # truncates the file under the reader's mapping
+    assert reader.read() is None
+    assert reader.capacity == 4
+    for n in range(6):
+        writer.publish(complete(n))
+    assert [r.decode()["timestamp"] for r in reader] == [2, 3, 4, 5]
+    writer.close()
+    reader.close()
+
+
+def test_reader_follows_replaced_file(tmp_path):
+    path = tmp_path / "events.ring"
+    writer = EventRingWriter(str(path), capacity=4)
+    reader = EventRingReader(str(path))
+    writer.close()
+
+    path.unlink()
+    writer = EventRingWriter(str(path), capacity=4)
+    assert reader.read() is None
+    writer.publish(complete(7))
+    assert [r.decode()["timestamp"] for r in reader] == [7]
+    writer.close()
+    reader.close()
+
+
+def test_reader_is_read_only(ring, tmp_path):
+    ring.publish(complete(1))
+    path = tmp_path / "events.ring"
+    path.chmod(0o444)
+    reader = EventRingReader(str(path), from_start=True)
+    assert [r.seq for r in reader] == [0]
+    with pytest.raises(TypeError):
+        reader.mm[0] = 0
+    reader.close()
+
+
+def test_import_does_not_load_solders():
+    code = "import sys, src.event_ring; assert 'solders' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
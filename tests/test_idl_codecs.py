@@ -0,0 +1,288 @@
+import dataclasses
+import json
+import random
+import string
+
+import pytest
+from solders.pubkey import Pubkey  # type: ignore
+
+from src import idl_compiler
+from src.idl_compiler import (
+    compile_stub,
+    event_discriminator,
+    event_fields,
+    load_codecs,
+    load_protocol_codecs,
+)
+
+construct = pytest.importorskip("construct")
+from construct import (  # noqa: E402
+    Bytes,
+    Flag,
+    Int8ul,
+    Int16ul,
+    Int64sl,
+    Int64ul,
+    PaddedString,
+    Padding,
+    Struct,
+)
+
+PROTOCOLS = ("jupiter", "pump", "raydium")
+
+# The hand-written construct layouts the generated codecs replaced, kept as reference
+_JUPITER_POOL_FIELDS = (
+    "timestamp" / Int64sl,
+    "index" / Int16ul,
+    "creator" / Bytes(32),
+    "base_mint" / Bytes(32),
+    "quote_mint" / Bytes(32),
+    "base_mint_decimals" / Int8ul,
+    "quote_mint_decimals" / Int8ul,
+    "base_amount_in" / Int64ul,
+    "quote_amount_in" / Int64ul,
+    "pool_base_amount" / Int64ul,
+    "pool_quote_amount" / Int64ul,
+    "minimum_liquidity" / Int64ul,
+    "initial_liquidity" / Int64ul,
+    "lp_token_amount_out" / Int64ul,
+    "pool_bump" / Int8ul,
+    "pool" / Bytes(32),
+    "lp_mint" / Bytes(32),
+    "user_base_token_account" / Bytes(32),
+    "user_quote_token_account" / Bytes(32),
+)
+REFERENCE_LAYOUTS = {
+    "JupiterCreatePoolEvent": Struct(Padding(8), *_JUPITER_POOL_FIELDS),
+    "JupiterSwapEvent": Struct(Padding(8), *_JUPITER_POOL_FIELDS),
+    "PumpCreateEvent": Struct(
+        "name" / PaddedString(32, "utf-8"),
+        "symbol" / PaddedString(10, "utf-8"),
+        "uri" / PaddedString(100, "utf-8"),
+        "mint" / Bytes(32),
+        "bonding_curve" / Bytes(32),
+        "user" / Bytes(32),
+    ),
+    "PumpTradeEvent": Struct(
+        "mint" / Bytes(32),
+        "sol_amount" / Int64ul,
+        "token_amount" / Int64ul,
+        "is_buy" / Flag,
+        "user" / Bytes(32),
+        "timestamp" / Int64ul,
+        "virtual_sol_reserves" / Int64ul,
+        "virtual_token_reserves" / Int64ul,
+    ),
+    "PumpCompleteEvent": Struct(
+        "user" / Bytes(32),
+        "mint" / Bytes(32),
+        "bonding_curve" / Bytes(32),
+        "timestamp" / Int64ul,
+    ),
+    "RaydiumInitPoolEvent": Struct(
+        Padding(8),
+        "nonce" / Int64ul,
+        "open_time" / Int64ul,
+        "init_pc_amount" / Int64ul,
+        "init_coin_amount" / Int64ul,
+        *(
+            name / Bytes(32)
+            for name in (
+                "base_mint",
+                "quote_mint",
+                "lp_mint",
+                "amm_id",
+                "amm_authority",
+                "amm_open_orders",
+                "amm_target_orders",
+                "pool_coin_token_account",
+                "pool_pc_token_account",
+                "pool_withdraw_queue",
+                "pool_lp_token_account",
+                "serum_market",
+            )
+        ),
+    ),
+    "RaydiumSwapEvent": Struct(
+        Padding(8),
+        "amm_id" / Bytes(32),
+        "user" / Bytes(32),
+        "direction" / Int8ul,
+        "amount_in" / Int64ul,
+        "amount_out" / Int64ul,
+        "fee_amount" / Int64ul,
+        "base_reserve_before" / Int64ul,
+        "quote_reserve_before" / Int64ul,
+        "base_reserve_after" / Int64ul,
+        "quote_reserve_after" / Int64ul,
+        "timestamp" / Int64sl,
+    ),
+    "RaydiumLiquidityEvent": Struct(
+        Padding(8),
+        "amm_id" / Bytes(32),
+        "user" / Bytes(32),
+        "is_deposit" / Flag,
+        "base_amount" / Int64ul,
+        "quote_amount" / Int64ul,
+        "lp_amount" / Int64ul,
+        "base_reserve_after" / Int64ul,
+        "quote_reserve_after" / Int64ul,
+        "lp_supply_after" / Int64ul,
+        "timestamp" / Int64sl,
+    ),
+}
+
+EVENTS = [(protocol, name) for protocol in PROTOCOLS for name in event_fields(protocol)]
+
+
+def reference_decode(name: str, data: bytes) -> dict | None:
+    try:
+        parsed = REFERENCE_LAYOUTS[name].parse(data)
+    except Exception:
+        return None
+    decoded = {}
+    for key, value in parsed.items():
+        if key.startswith("_"):
+            continue
+        if isinstance(value, bytes):
+            value = str(Pubkey.from_bytes(value))
+        elif isinstance(value, str):
+            value = value.rstrip("\x00")
+        decoded[key] = value
+    return decoded
+
+
+def random_value(rng: random.Random, field: dict):
+    ftype = field["type"]
+    if ftype in ("publicKey", "pubkey"):
+        return str(Pubkey.from_bytes(rng.randbytes(32)))
+    if ftype == "bool":
+        return rng.random() < 0.5
+    if isinstance(ftype, dict):
+        length = ftype["array"][1]
+        if field.get("utf8"):
+            return "".join(
+                rng.choices(string.ascii_letters, k=rng.randrange(length + 1))
+            )
+        return rng.randbytes(length)
+    bits = int(ftype[1:])
+    if ftype.startswith("i"):
+        return rng.randrange(-(1 << (bits - 1)), 1 << (bits - 1))
+    return rng.randrange(1 << bits)
+
+
+def random_event(rng: random.Random, protocol: str, name: str):
+    cls = getattr(load_protocol_codecs(protocol), name)
+    return cls(
+        **{
+            attr: random_value(rng, field)
+            for attr, field in event_fields(protocol)[name].items()
+        }
+    )
+
+
+def decoder(protocol: str, name: str):
+    return load_protocol_codecs(protocol).EVENT_DECODERS[name]
+
+
+@pytest.mark.parametrize("protocol,name", EVENTS)
+def test_decoders_match_construct_layouts_on_random_payloads(protocol, name):
+    rng = random.Random(name)
+    decode = decoder(protocol, name)
+    size = REFERENCE_LAYOUTS[name].sizeof()
+    for _ in range(200):
+        payload = rng.randbytes(
+            rng.choice((size, size + rng.randrange(1, 16), rng.randrange(size)))
+        )
+        event = decode(payload)
+        assert (dataclasses.asdict(event) if event else None) == reference_decode(
+            name, payload
+        )
+
+
+@pytest.mark.parametrize("protocol,name", EVENTS)
+def test_decoders_match_construct_layouts_on_encoded_events(protocol, name):
+    rng = random.Random(name)
+    encode = load_protocol_codecs(protocol).EVENT_ENCODERS[name]
+    for _ in range(50):
+        payload = encode(random_event(rng, protocol, name))
+        assert dataclasses.asdict(decoder(protocol, name)(payload)) == reference_decode(
+            name, payload
+        )
+
+
+@pytest.mark.parametrize("protocol,name", EVENTS)
+def test_encode_decode_round_trip(protocol, name):
+    rng = random.Random(name)
+    codecs = load_protocol_codecs(protocol)
+    encode, decode = codecs.EVENT_ENCODERS[name], codecs.EVENT_DECODERS[name]
+    for _ in range(50):
+        event = random_event(rng, protocol, name)
+        payload = encode(event)
+        assert decode(payload) == event
+        assert encode(decode(payload)) == payload
+        assert codecs.decode_event(payload) == event
+
+
+@pytest.mark.parametrize("protocol", ["jupiter", "raydium"])
+def test_discriminator_table(protocol):
+    codecs = load_protocol_codecs(protocol)
+    prefix = protocol.capitalize()
+    for name, decode in codecs.EVENT_DECODERS.items():
+        discriminator = event_discriminator(name[len(prefix) :])
+        assert codecs.DISCRIMINATORS[discriminator] is decode
+        assert (
+            codecs.EVENT_ENCODERS[name](
+                random_event(random.Random(name), protocol, name)
+            )[:8]
+            == discriminator
+        )
+    assert len(codecs.DISCRIMINATORS) == len(codecs.EVENT_DECODERS)
+
+
+def test_headerless_idl_has_no_discriminators():
+    assert load_protocol_codecs("pump").DISCRIMINATORS == {}
+
+
+def test_dispatch_prefers_discriminator_over_idl_order():
+    codecs = load_protocol_codecs("raydium")
+    rng = random.Random(1)
+    swap = codecs.EVENT_ENCODERS["RaydiumSwapEvent"](
+        random_event(rng, "raydium", "RaydiumSwapEvent")
+    )
+
+    # A liquidity event is shorter than a swap, so the swap body also decodes as one
+    as_liquidity = event_discriminator("LiquidityEvent") + swap[8:]
+    assert type(codecs.decode_event(as_liquidity)).__name__ == "RaydiumLiquidityEvent"
+    assert type(codecs.decode_event(swap)).__name__ == "RaydiumSwapEvent"
+
+    # Unknown discriminator: first event in IDL order that decodes (init pool is longer)
+    assert type(codecs.decode_event(bytes(8) + swap[8:])).__name__ == "RaydiumSwapEvent"
+    assert codecs.decode_event(bytes(8)) is None
+
+
+def test_codec_cache_is_keyed_on_compiler_source(tmp_path, monkeypatch):
+    idl_path = idl_compiler.IDL_DIR / "pump.json"
+    monkeypatch.setattr(idl_compiler, "COMPILER_DIGEST", b"compiler")
+    first = load_codecs(idl_path, str(tmp_path))
+    assert load_codecs(idl_path, str(tmp_path)) is first
+    assert len(list(tmp_path.glob("*.py"))) == 1
+
+    monkeypatch.setattr(idl_compiler, "COMPILER_DIGEST", b"edited compiler")
+    second = load_codecs(idl_path, str(tmp_path))
+    assert second.__name__ != first.__name__
+    assert len(list(tmp_path.glob("*.py"))) == 2
+
+
+@pytest.mark.parametrize("protocol", PROTOCOLS)
+def test_committed_stubs_are_up_to_date(protocol):
+    idl = json.loads((idl_compiler.IDL_DIR / f"{protocol}.json").read_bytes())
+    # Regenerate with:
+    #   python -m src.idl_compiler --stub src/idl/<protocol>.json \
+    #       > src/<protocol>_codecs.pyi
+    stub = (idl_compiler.IDL_DIR.parent / f"{protocol}_codecs.pyi").read_text()
+    assert stub == compile_stub(idl)
+    assert all(
+        f"class {cls.__name__}:" in stub
+        for cls in load_protocol_codecs(protocol).EVENT_CLASSES
+    )
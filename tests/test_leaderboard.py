@@ -0,0 +1,102 @@
+import pytest
+
+from src.leaderboard import (
+    Leaderboard,
+    SlidingWindowSketch,
+    TopCandidates,
+    sketch_indexes,
+)
+
+
+def make_board(**kwargs):
+    return Leaderboard(
+        windows={"1m": (60, 12), "5m": (300, 30)},
+        depth=4,
+        width=256,
+        capacity=8,
+        **kwargs,
+    )
+
+
+def test_top_orders_by_volume_and_trades():
+    board = make_board()
+    for _ in range(3):
+        board.record_trade("mint", "few-large", 1_000, now=10)
+    for _ in range(10):
+        board.record_trade("mint", "many-small", 10, now=10)
+
+    by_volume = board.top("mint", "1m", "volume", n=2, now=11)
+    assert [row["mint"] for row in by_volume] == ["few-large", "many-small"]
+    assert by_volume[0] == {"mint": "few-large", "volume": 3_000, "trades": 3}
+
+    by_trades = board.top("mint", "1m", "trades", n=1, now=11)
+    assert by_trades == [{"mint": "many-small", "trades": 10, "volume": 100}]
+
+
+def test_top_is_bounded_by_n_and_kind():
+    board = make_board()
+    for i in range(5):
+        board.record_trade("pool", f"pool-{i}", 100 * (i + 1), now=0)
+
+    assert [row["pool"] for row in board.top("pool", "1m", n=3, now=0)] == [
+        "pool-4",
+        "pool-3",
+        "pool-2",
+    ]
+    assert board.top("mint", "1m", now=0) == []
+
+
+def test_trades_expire_from_short_window_only():
+    board = make_board()
+    board.record_trade("mint", "early", 500, now=0)
+    board.record_trade("mint", "late", 100, now=30)
+
+    # Both inside the last minute
+    assert {row["mint"] for row in board.top("mint", "1m", now=59)} == {"early", "late"}
+    # The bucket holding t=0 rotates out at t=60; t=30 is still in the window
+    assert [row["mint"] for row in board.top("mint", "1m", now=60)] == ["late"]
+    assert {row["mint"] for row in board.top("mint", "5m", now=60)} == {"early", "late"}
+    # Long gap clears the whole ring
+    assert board.top("mint", "1m", now=1_000) == []
+    assert board.top("mint", "5m", now=1_000) == []
+
+
+def test_sketch_never_goes_negative_after_rotation():
+    sketch = SlidingWindowSketch(window_seconds=10, num_buckets=5, depth=2, width=16)
+    indexes = sketch_indexes("key", 2, 16)
+    sketch.advance(0)
+    sketch.add(indexes, 7)
+    sketch.advance(4)
+    sketch.add(indexes, 3)
+    assert sketch.estimate(indexes) == 10
+    sketch.advance(10)  # epoch 5 reuses the t=0 bucket
+    assert sketch.estimate(indexes) == 3
+    sketch.advance(13)
+    assert sketch.estimate(indexes) == 3
+    sketch.advance(14)  # 2 s buckets: the t=4 bucket is reused at t=14
+    assert sketch.estimate(indexes) == 0
+
+
+def test_candidates_keep_heaviest_keys():
+    candidates = TopCandidates(capacity=2)
+    for key, score in (("a", 1), ("b", 5), ("c", 3), ("d", 0.5)):
+        candidates.offer(key, (), score)
+    assert candidates.top(5) == [("b", 5), ("c", 3)]
+
+
+def test_record_ignores_non_trade_events():
+    class PumpCreateEvent:
+        mint = "m"
+
+    board = make_board()
+    board.record(PumpCreateEvent(), now=0)
+    assert board.top("mint", "1m", now=0) == []
+
+
+def test_query_validates_arguments():
+    board = make_board()
+    with pytest.raises(ValueError):
+        board.query({"window": "2h"})
+    with pytest.raises(ValueError):
+        board.query({"metric": "fees"})
+    assert set(board.query({})) == {"mint", "pool"}
@@ -0,0 +1,123 @@
+import sys
+import threading
+import tracemalloc
+
+import pytest
+
+from src.profiler import Profiler
+
+
+class Processor:
+    def process_logs(self, logs):
+        return [decode_event(line) for line in logs]
+
+
+class Socket:
+    def __init__(self, processor):
+        self.processor = processor
+        self.on_message = self.handle
+
+    def handle(self, message):
+        return self.processor.process_logs(message.split())
+
+
+def decode_event(line):
+    return line.upper()
+
+
+def wait_for_capture(profiler, timeout=10.0):
+    for thread in threading.enumerate():
+        if thread.name == "profiler":
+            thread.join(timeout)
+    assert profiler.capture is None
+
+
+@pytest.fixture
+def hooked(tmp_path):
+    processor = Processor()
+    ws = Socket(processor)
+    profiler = Profiler(output_dir=str(tmp_path), sample_interval=0.001)
+    profiler.hook("on_message", ws, "on_message")
+    profiler.hook("process_logs", processor, "process_logs")
+    return profiler, ws, processor
+
+
+def test_cprofile_capture_restores_hooks(hooked, tmp_path):
+    profiler, ws, processor = hooked
+    on_message = ws.on_message
+
+    info = profiler.start(seconds=0.2, mode="cprofile", memory=False)
+    assert info["mode"] == "cprofile"
+    assert ws.on_message is not on_message
+    assert "process_logs" in vars(processor)
+    assert ws.on_message("a b") == ["A", "B"]
+
+    wait_for_capture(profiler)
+    assert ws.on_message is on_message
+    assert "process_logs" not in vars(processor)  # class attribute visible again
+    assert profiler._wrapped == []
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert [f for f in files if f.endswith(".prof")]
+    summary = next(tmp_path.glob("*-summary.txt")).read_text()
+    assert "decoder  decode_event" in summary
+
+
+def test_hook_registered_during_capture_is_restored(hooked):
+    profiler, ws, processor = hooked
+    profiler.start(seconds=0.2, mode="cprofile", memory=False)
+
+    late = Processor()
+    profiler.hook("late", late, "process_logs")
+    assert "process_logs" in vars(late)
+
+    wait_for_capture(profiler)
+    assert "process_logs" not in vars(late)
+
+
+def test_sample_capture_leaves_hooks_and_switch_interval(hooked, tmp_path):
+    profiler, ws, processor = hooked
+    on_message = ws.on_message
+    switch_interval = sys.getswitchinterval()
+
+    profiler.start(seconds=0.2, mode="sample", memory=False)
+    assert ws.on_message is on_message
+    wait_for_capture(profiler)
+
+    assert sys.getswitchinterval() == switch_interval
+    assert list(tmp_path.glob("*-sample.folded"))
+    assert list(tmp_path.glob("*-sample-summary.txt"))
+
+
+def test_memory_capture_stops_tracemalloc_it_started(hooked, tmp_path):
+    profiler, _, _ = hooked
+    assert not tracemalloc.is_tracing()
+
+    profiler.start(seconds=0.1, mode="cprofile", memory=True)
+    assert tracemalloc.is_tracing()
+    wait_for_capture(profiler)
+
+    assert not tracemalloc.is_tracing()
+    assert list(tmp_path.glob("*-memory.txt"))
+
+
+def test_one_capture_at_a_time(hooked):
+    profiler, ws, _ = hooked
+    on_message = ws.on_message
+    profiler.start(seconds=0.2, mode="cprofile", memory=False)
+    with pytest.raises(ValueError, match="already running"):
+        profiler.start(seconds=0.2, mode="sample")
+
+    wait_for_capture(profiler)
+    assert ws.on_message is on_message
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"mode": "trace"}, {"seconds": "0"}, {"seconds": "100000"}, {"seconds": "soon"}],
+)
+def test_query_validation(hooked, params):
+    profiler, _, _ = hooked
+    with pytest.raises(ValueError):
+        profiler.query(params)
+    assert profiler.capture is None
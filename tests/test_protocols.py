@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.event_processor import EventProcessor
+from src.protocols import enabled_protocols
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def loaded_modules(code: str, protocols: str = "jupiter,pump,raydium") -> set[str]:
+    """Run code in a fresh interpreter and return the modules it left in sys.modules."""
+    env = dict(os.environ, SOLANA_SCRAPER_PROTOCOLS=protocols)
+    proc = subprocess.run(
+        [sys.executable, "-c", f"import sys\n{code}\nprint(' '.join(sys.modules))"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(proc.stdout.split())
+
+
+def test_only_enabled_layouts_are_imported():
+    modules = loaded_modules(
+        "from src.event_processor import EventProcessor\nEventProcessor(['pump'])"
+    )
+    assert "src.pump_layout" in modules
+    assert "src.jupiter_layout" not in modules
+    assert "src.raydium_layout" not in modules
+
+
+def test_importing_wss_defers_services():
+    modules = loaded_modules("import src.wss", protocols="pump")
+    assert "src.pump_layout" in modules
+    assert not {"src.jupiter_layout", "src.raydium_layout", "src.event_ring"} & modules
+    assert (
+        not {"src.leaderboard", "src.wallet_index", "src.query_api", "src.profiler"}
+        & modules
+    )
+    assert not {"http.server", "cProfile", "tracemalloc"} & modules
+
+
+def test_start_tracking_adds_recorders():
+    processor = EventProcessor(["pump"])
+    assert processor.leaderboard is None and processor.wallet_index is None
+    assert processor.recorders == [processor.market_state.record]
+
+    leaderboard, wallet_index = processor.start_tracking()
+    assert (processor.leaderboard, processor.wallet_index) == (
+        leaderboard,
+        wallet_index,
+    )
+    assert processor.start_tracking()[0] is leaderboard
+    assert len(processor.recorders) == 3
+
+
+def test_unknown_protocol_is_rejected():
+    with pytest.raises(ValueError, match="Unknown protocol"):
+        enabled_protocols(["pump", "orca"])
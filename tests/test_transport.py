@@ -0,0 +1,201 @@
+import base64
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+import websocket
+
+from src.constants import PUMP_FUN_PROGRAM_ID
+from src.pump_layout import decode_pump_event
+from src.transport import (
+    DEFLATE_OFFER,
+    TransportStats,
+    attach,
+    is_failed_transaction,
+    parse_deflate_response,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+import mock_solana_ws  # noqa: E402
+
+NOTIFICATIONS = 40
+
+
+def receive(config, offer=True, count=NOTIFICATIONS, timeout=10.0):
+    """Run the real client with the inflating frame buffer against the mock.
+
+    Returns the notifications received and the transport stats.
+    """
+    server = mock_solana_ws.MockSolanaServer("127.0.0.1", 0, config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stats = TransportStats()
+    notifications, errors = [], []
+
+    def on_open(ws):
+        attach(ws.sock, stats)
+        ws.send(
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "logsSubscribe",
+                    "params": [
+                        {"mentions": [PUMP_FUN_PROGRAM_ID]},
+                        {"commitment": "processed"},
+                    ],
+                }
+            )
+        )
+
+    def on_message(ws, message):
+        message = json.loads(message)
+        if message.get("method") == "logsNotification":
+            notifications.append(message)
+            if len(notifications) >= count:
+                ws.close()
+
+    ws = websocket.WebSocketApp(
+        f"ws://127.0.0.1:{server.server_address[1]}/",
+        on_open=on_open,
+        on_message=on_message,
+        on_error=lambda ws, e: errors.append(e),
+        header=[DEFLATE_OFFER] if offer else None,
+    )
+    client = threading.Thread(target=ws.run_forever, daemon=True)
+    client.start()
+    client.join(timeout)
+    ws.close()
+    server.shutdown()
+    server.server_close()
+    assert not errors
+    return notifications, stats
+
+
+def mock_config(**kwargs):
+    return mock_solana_ws.MockConfig(
+        rate=1000,
+        mix={"PumpTradeEvent": 3, "PumpCreateEvent": 1},
+        pool_size=8,
+        **kwargs,
+    )
+
+
+def program_data(notification):
+    logs = notification["params"]["result"]["value"]["logs"]
+    return next(
+        base64.b64decode(line.split(": ", 1)[1])
+        for line in logs
+        if line.startswith("Program data: ")
+    )
+
+
+@pytest.mark.parametrize(
+    "deflate,no_context_takeover,fragment_size",
+    [
+        (False, False, 0),
+        (False, False, 100),
+        (True, False, 0),
+        (True, False, 16),
+        (True, True, 0),
+        (True, True, 16),
+    ],
+)
+def test_client_against_mock(deflate, no_context_takeover, fragment_size):
+    config = mock_config(
+        deflate=deflate,
+        no_context_takeover=no_context_takeover,
+        fragment_size=fragment_size,
+    )
+    notifications, stats = receive(config)
+
+    assert len(notifications) == NOTIFICATIONS
+    assert all(decode_pump_event(program_data(n)) is not None for n in notifications)
+    assert stats.compressed is deflate
+    if deflate:
+        assert stats.message_bytes > stats.wire_bytes
+    else:
+        assert stats.message_bytes == stats.wire_bytes
+    if fragment_size:
+        assert stats.frames >= 2 * NOTIFICATIONS
+
+
+def test_mock_without_deflate_ignores_offer():
+    notifications, stats = receive(mock_config(deflate=False), offer=True)
+    assert len(notifications) == NOTIFICATIONS
+    assert not stats.compressed
+
+
+def test_client_without_offer_gets_plain_frames():
+    notifications, stats = receive(mock_config(deflate=True), offer=False)
+    assert len(notifications) == NOTIFICATIONS
+    assert not stats.compressed
+
+
+def test_parse_deflate_response():
+    assert parse_deflate_response(None) is None
+    assert parse_deflate_response("x-webkit-deflate-frame") is None
+    assert parse_deflate_response("permessage-deflate") == {}
+    assert parse_deflate_response(
+        "foo, permessage-deflate; server_no_context_takeover; server_max_window_bits=10"
+    ) == {
+        "server_no_context_takeover": "",
+        "server_max_window_bits": "10",
+    }
+
+
+def test_is_failed_transaction():
+    ok = (
+        '{"value": {"signature": "s", "err": null, '
+        '"logs": ["Program log: \\"err\\": 1"]}}'
+    )
+    failed = (
+        '{"value": {"signature": "s", "err": {"InstructionError": [0, "x"]}, '
+        '"logs": []}}'
+    )
+    assert not is_failed_transaction(ok)
+    assert is_failed_transaction(failed)
+    assert not is_failed_transaction('{"result": 1}')
+
+
+def test_attach_rejects_unknown_socket():
+    with pytest.raises(RuntimeError, match="frame buffer"):
+        attach(object(), TransportStats())
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sock = object()
+        self.sent = []
+        self.closed = False
+
+    def send(self, data):
+        self.sent.append(json.loads(data))
+
+    def close(self):
+        self.closed = True
+
+
+def test_on_open_falls_back_when_attach_fails(monkeypatch):
+    from src import wss
+
+    def broken_attach(sock, stats):
+        raise AttributeError("'WebSocket' object has no attribute '_recv'")
+
+    monkeypatch.setattr(wss, "attach", broken_attach)
+    monkeypatch.setattr(wss, "offer_deflate", True)
+
+    ws = FakeWebSocket()
+    wss.on_open(ws)
+    assert ws.closed and not ws.sent
+    assert wss.offer_deflate is False
+
+    # The next connection is made without the offer and subscribes with the stock
+    # frame buffer
+    ws = FakeWebSocket()
+    wss.on_open(ws)
+    assert not ws.closed
+    assert [r["method"] for r in ws.sent] == ["logsSubscribe"] * len(
+        wss.event_processor.layouts
+    )
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+
+import pytest
+
+from src.base58 import b58encode
+from src.wallet_index import WalletIndex
+
+
+@dataclass
+class PumpTradeEvent:
+    user: str
+    mint: str
+    sol_amount: int
+
+
+def key(n: int) -> str:
+    return b58encode(bytes([n]) * 32)
+
+
+def trade(wallet: int, mint: int, amount: int = 1) -> PumpTradeEvent:
+    return PumpTradeEvent(key(wallet), key(mint), amount)
+
+
+def test_last_trades_newest_first():
+    index = WalletIndex(max_events=16)
+    for amount in (10, 20, 30):
+        index.record(trade(1, 2, amount), now=amount)
+
+    trades = index.last_trades(key(1))
+    assert [t["amount"] for t in trades] == [30, 20, 10]
+    assert trades[0] == {
+        "seq": 2,
+        "timestamp": 30,
+        "event": "PumpTradeEvent",
+        "wallet": key(1),
+        "mint": key(2),
+        "amount": 30,
+    }
+    assert index.last_trades(key(1), n=1)[0]["amount"] == 30
+    assert index.mints_touched(key(1)) == [key(2)]
+
+
+def test_overwritten_log_records_are_skipped():
+    index = WalletIndex(max_events=3, per_wallet_cap=8)
+    for amount in range(5):
+        index.record(trade(1, 2, amount), now=amount)
+
+    # Only the last three records survive in the shared log
+    assert [t["amount"] for t in index.last_trades(key(1))] == [4, 3, 2]
+    assert index.wallets_for_mint(key(2), window=100, now=5) == [key(1)]
+
+
+def test_log_grows_on_demand():
+    index = WalletIndex(max_events=3)
+    assert len(index.log.seqs) == 0 and len(index.log.wallets) == 0
+    for amount in range(5):
+        index.record(trade(1, 2, amount), now=amount)
+        assert len(index.log.seqs) == min(amount + 1, 3)
+    assert len(index.log.wallets) == 32 * 3
+
+
+def test_overwritten_by_another_wallet():
+    index = WalletIndex(max_events=2, per_wallet_cap=8)
+    index.record(trade(1, 9), now=0)
+    index.record(trade(2, 9), now=1)
+    index.record(trade(3, 9), now=2)
+
+    assert index.last_trades(key(1)) == []
+    assert index.mints_touched(key(1)) == []
+    assert index.wallets_for_mint(key(9), window=100, now=3) == [key(3), key(2)]
+
+
+def test_per_wallet_ring_keeps_most_recent():
+    index = WalletIndex(max_events=100, per_wallet_cap=2)
+    for amount in range(5):
+        index.record(trade(1, 2, amount), now=amount)
+    assert [t["amount"] for t in index.last_trades(key(1))] == [4, 3]
+
+
+def test_least_recently_active_wallet_is_evicted():
+    index = WalletIndex(max_events=100, max_wallets=2)
+    index.record(trade(1, 9), now=0)
+    index.record(trade(2, 9), now=1)
+    index.record(trade(1, 9), now=2)  # wallet 1 is now the most recent
+    index.record(trade(3, 9), now=3)
+
+    assert index.last_trades(key(2)) == []
+    assert len(index.last_trades(key(1))) == 2
+    assert len(index.last_trades(key(3))) == 1
+
+
+def test_wallets_for_mint_respects_window():
+    index = WalletIndex(max_events=100)
+    index.record(trade(1, 9), now=0)
+    index.record(trade(2, 9), now=200)
+    index.record(trade(1, 9), now=250)
+
+    assert index.wallets_for_mint(key(9), window=60, now=260) == [key(1), key(2)]
+    assert index.wallets_for_mint(key(9), window=20, now=260) == [key(1)]
+
+
+def test_invalid_keys_and_other_events_are_ignored():
+    index = WalletIndex(max_events=4)
+    index.record(PumpTradeEvent("not-a-pubkey", key(2), 1), now=0)
+
+    class PumpSetParamsEvent:
+        pass
+
+    index.record(PumpSetParamsEvent(), now=0)
+    assert index.log.next_seq == 0
+
+
+def test_queries_require_parameters():
+    index = WalletIndex(max_events=4)
+    with pytest.raises(ValueError):
+        index.query_wallet({})
+    with pytest.raises(ValueError):
+        index.query_mint_wallets({})